@@ -0,0 +1,195 @@
+"""Incremental per-athlete totals over computed workouts.
+
+Every update is O(1): a workout only touches the running sums of its
+athlete, its workout type and its day and week. Aggregators built by
+separate workers are combined with merge().
+
+Usage:
+    aggregator = Aggregator()
+    aggregator.add('athlete-1', training, date(2021, 10, 1))
+    aggregator.athletes['athlete-1'].totals.as_dict()
+"""
+from datetime import date
+from typing import Dict, Optional, Union
+
+from homework import InfoMessage, Training
+
+METRICS = ('duration', 'distance', 'speed', 'calories')
+
+
+class Summary:
+    """Count, sum, minimum and maximum of a stream of values."""
+    __slots__ = ('count', 'total', 'minimum', 'maximum')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.minimum = float('inf')
+        self.maximum = float('-inf')
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other: 'Summary') -> None:
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {'count': self.count, 'sum': self.total, 'mean': self.mean,
+                'min': self.minimum, 'max': self.maximum}
+
+
+class WorkoutTotals:
+    """Summaries of every InfoMessage metric for a group of workouts."""
+    __slots__ = ('metrics',)
+
+    def __init__(self) -> None:
+        self.metrics: Dict[str, Summary] = {
+            name: Summary() for name in METRICS
+        }
+
+    def add(self, info: InfoMessage) -> None:
+        for name, summary in self.metrics.items():
+            summary.add(getattr(info, name))
+
+    def merge(self, other: 'WorkoutTotals') -> None:
+        for name, summary in self.metrics.items():
+            summary.merge(other.metrics[name])
+
+    @property
+    def count(self) -> int:
+        return self.metrics['duration'].count
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        return {name: summary.as_dict()
+                for name, summary in self.metrics.items()}
+
+
+class Window:
+    """Totals per period (day or week), keeping only the latest ones.
+
+    Periods are counted back from the latest one seen, so workouts that
+    arrive late (from another worker, for instance) are still added to
+    their period if it is kept, and ignored if it has already expired.
+    """
+    __slots__ = ('length', 'keep', 'periods', 'latest')
+
+    def __init__(self, length: int, keep: int) -> None:
+        self.length = length
+        self.keep = keep
+        self.periods: Dict[int, WorkoutTotals] = {}
+        self.latest: Optional[int] = None
+
+    def period(self, day: date) -> int:
+        """Get back the number of the period the day belongs to.
+
+        Weeks start on Monday, since date.fromordinal(1) is a Monday.
+        """
+        return (day.toordinal() - 1) // self.length
+
+    def add(self, info: InfoMessage, day: date) -> None:
+        period = self.period(day)
+        if self.latest is None or period > self.latest:
+            self.latest = period
+            self.expire()
+        elif period <= self.latest - self.keep:
+            return
+        totals = self.periods.get(period)
+        if totals is None:
+            totals = self.periods[period] = WorkoutTotals()
+        totals.add(info)
+
+    def merge(self, other: 'Window') -> None:
+        for period, totals in other.periods.items():
+            self.periods.setdefault(period, WorkoutTotals()).merge(totals)
+        if other.latest is not None and (self.latest is None
+                                         or other.latest > self.latest):
+            self.latest = other.latest
+        self.expire()
+
+    def expire(self) -> None:
+        """Drops periods older than the latest keep ones."""
+        if self.latest is None:
+            return
+        oldest = self.latest - self.keep + 1
+        if any(period < oldest for period in self.periods):
+            self.periods = {period: totals
+                            for period, totals in self.periods.items()
+                            if period >= oldest}
+
+    def get(self, day: date) -> Optional[WorkoutTotals]:
+        """Get back the totals of the period the day belongs to."""
+        return self.periods.get(self.period(day))
+
+
+class AthleteStats:
+    """Totals of an athlete overall, per workout type, per day and per
+    week."""
+    __slots__ = ('totals', 'by_type', 'daily', 'weekly')
+
+    def __init__(self, keep_days: int = 31, keep_weeks: int = 12) -> None:
+        self.totals = WorkoutTotals()
+        self.by_type: Dict[str, WorkoutTotals] = {}
+        self.daily = Window(1, keep_days)
+        self.weekly = Window(7, keep_weeks)
+
+    def add(self, info: InfoMessage, day: date) -> None:
+        self.totals.add(info)
+        by_type = self.by_type.get(info.training_type)
+        if by_type is None:
+            by_type = self.by_type[info.training_type] = WorkoutTotals()
+        by_type.add(info)
+        self.daily.add(info, day)
+        self.weekly.add(info, day)
+
+    def merge(self, other: 'AthleteStats') -> None:
+        self.totals.merge(other.totals)
+        for training_type, totals in other.by_type.items():
+            self.by_type.setdefault(training_type,
+                                    WorkoutTotals()).merge(totals)
+        self.daily.merge(other.daily)
+        self.weekly.merge(other.weekly)
+
+
+class Aggregator:
+    """Per-athlete statistics fed with workouts one at a time."""
+
+    def __init__(self, keep_days: int = 31, keep_weeks: int = 12) -> None:
+        self.keep_days = keep_days
+        self.keep_weeks = keep_weeks
+        self.athletes: Dict[str, AthleteStats] = {}
+
+    def add(self,
+            athlete: str,
+            workout: Union[InfoMessage, Training],
+            day: date
+            ) -> None:
+        """Adds a workout, given as a Training or its InfoMessage."""
+        if isinstance(workout, Training):
+            workout = workout.show_training_info()
+        stats = self.athletes.get(athlete)
+        if stats is None:
+            stats = self.athletes[athlete] = AthleteStats(self.keep_days,
+                                                          self.keep_weeks)
+        stats.add(workout, day)
+
+    def merge(self, other: 'Aggregator') -> 'Aggregator':
+        """Adds the statistics gathered by another aggregator."""
+        for athlete, stats in other.athletes.items():
+            own = self.athletes.get(athlete)
+            if own is None:
+                own = self.athletes[athlete] = AthleteStats(self.keep_days,
+                                                            self.keep_weeks)
+            own.merge(stats)
+        return self
@@ -0,0 +1,100 @@
+"""Compact metric columns for dashboards.
+
+Dashboards show distance, speed and calories with the three decimals
+of InfoMessage.TEMPLATE_INFO, so the float64 columns of
+calculate_batch() can be stored in half the memory:
+
+* 'milli' - int32 numbers of thousandths, rounded with round(value, 3)
+  like the template rounds them, so that messages show the same three
+  decimals as with float64 values. A value read back is off the
+  float64 one by at most MILLI_DEVIATION (half a thousandth) plus half
+  an ulp. Values beyond about +-2.1 million raise OverflowError;
+* 'float32' - values are off by at most FLOAT32_DEVIATION relative to
+  them (half an ulp of float32), which is more than a thousandth once
+  calories go beyond about 8000.
+
+Metrics are calculated in float64 from the package values as they are
+and rounded once, when stored. This matters for SportsWalking, whose
+calories take the floor of mean_speed ** 2 / height: rounding the
+package values or the speed to float32 first moves the quotient across
+an integer for packages near the boundary, and the calories by
+WLK_COEFF_CALORIE_2 * weight * duration * MIN_IN_HOUR at once. Rounded
+after the floor, the deviation stays within the bounds above.
+
+Usage:
+    metrics = CompactMetrics('milli')
+    metrics.extend(*calculate_batch(workout_types, **columns))
+    distance, speed, calories = metrics[0]
+"""
+from array import array
+from typing import Dict, Iterable, List, Tuple
+
+SCALE = 1000
+MILLI_DEVIATION = 0.5 / SCALE
+FLOAT32_DEVIATION = 2.0 ** -24
+METRICS = ('distance', 'speed', 'calories')
+TYPECODES = {'milli': 'i', 'float32': 'f'}
+
+
+def max_deviation(backend: str, value: float) -> float:
+    """Get back how far the stored value may be from a float64 value."""
+    if backend == 'milli':
+        return MILLI_DEVIATION + abs(value) * 2.0 ** -52
+    return abs(value) * FLOAT32_DEVIATION
+
+
+class CompactMetrics:
+    """Distance, speed and calories columns stored as int32 thousandths
+    or as float32."""
+    __slots__ = ('backend', 'columns')
+
+    def __init__(self, backend: str = 'milli') -> None:
+        if backend not in TYPECODES:
+            raise ValueError(f'Unknown numeric backend {backend}. '
+                             f'Try to use one of:{tuple(TYPECODES)}')
+        self.backend = backend
+        self.columns: Dict[str, array] = {
+            name: array(TYPECODES[backend]) for name in METRICS
+        }
+
+    def __len__(self) -> int:
+        return len(self.columns['distance'])
+
+    def __getitem__(self, index: int) -> Tuple[float, float, float]:
+        """Get back distance, speed and calories of a row as floats."""
+        distance, speed, calories = [self.columns[name][index]
+                                     for name in METRICS]
+        if self.backend == 'milli':
+            return distance / SCALE, speed / SCALE, calories / SCALE
+        return distance, speed, calories
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.itemsize * len(column)
+                   for column in self.columns.values())
+
+    def extend(self,
+               distance: Iterable[float],
+               speed: Iterable[float],
+               calories: Iterable[float]
+               ) -> 'CompactMetrics':
+        """Stores float64 metric columns, such as the ones returned by
+        calculate_batch(). All three are converted before any is
+        extended, so a value that doesn't fit leaves them unchanged."""
+        typecode = TYPECODES[self.backend]
+        converted = []
+        for values in (distance, speed, calories):
+            if self.backend == 'milli':
+                values = [round(round(value, 3) * SCALE)
+                          for value in values]
+            converted.append(array(typecode, values))
+        for name, values in zip(METRICS, converted):
+            self.columns[name].extend(values)
+        return self
+
+    def column(self, name: str) -> List[float]:
+        """Get back a metric column as floats."""
+        values = self.columns[name]
+        if self.backend == 'milli':
+            return [value / SCALE for value in values]
+        return values.tolist()
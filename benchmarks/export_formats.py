@@ -0,0 +1,45 @@
+"""Throughput of the bulk result writers against print(get_message()).
+
+Usage: python benchmarks/export_formats.py [messages]
+"""
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import export  # noqa: E402
+import homework  # noqa: E402
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    messages = [homework.InfoMessage('Running', 1.0, index / 7, 9.75,
+                                     index / 3)
+                for index in range(count)]
+    columns = {name: [getattr(message, name) for message in messages]
+               for name in export.FIELDS}
+    cases = {
+        'get_message lines': lambda out: out.write('\n'.join(
+            message.get_message() for message in messages)),
+        'CsvWriter': lambda out: export.CsvWriter(out).write(messages),
+        'JsonLinesWriter': lambda out: export.JsonLinesWriter(out).write(
+            messages),
+        'ColumnarWriter': lambda out: export.ColumnarWriter(out).write(
+            messages),
+        'ColumnarWriter columns': lambda out: export.ColumnarWriter(
+            out).write_columns(columns),
+    }
+    for name, write in cases.items():
+        out = io.BytesIO() if name.startswith('Columnar') else io.StringIO()
+        start = time.perf_counter()
+        write(out)
+        elapsed = time.perf_counter() - start
+        size = len(out.getvalue())
+        print(f'{name:24} {count / elapsed:12,.0f} rows/s '
+              f'{size / count:6.1f} bytes/row')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Gain of pipeline.Pipeline over a sequential loop with slow sources.
+
+Every source is a generator sleeping --latency seconds before each block
+of lines, as a file on a network mount or a socket would. The loop
+reads the sources one after another and prints every message like
+main(); the pipeline reads them with several threads.
+
+Usage: python benchmarks/io_overlap.py [--sources N] [--readers N]
+"""
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import homework  # noqa: E402
+from pipeline import Pipeline  # noqa: E402
+
+LINES = [
+    'SWM,720,1,80,25,40',
+    'RUN,15000,1,75',
+    'WLK,9000,1,75,180',
+]
+
+
+def slow_source(blocks, block_size, latency):
+    for _ in range(blocks):
+        time.sleep(latency)
+        yield from LINES * (block_size // len(LINES))
+
+
+def sequential(sources, out):
+    stdout = sys.stdout
+    sys.stdout = out
+    try:
+        for source in sources:
+            for package in homework.read_packages(source):
+                homework.main(homework.read_package(*package))
+    finally:
+        sys.stdout = stdout
+
+
+def main(args):
+    def sources():
+        return [slow_source(args.blocks, args.block_size, args.latency)
+                for _ in range(args.sources)]
+
+    total = args.sources * args.blocks * args.block_size
+    start = time.perf_counter()
+    sequential(sources(), io.StringIO())
+    print(f'{"sequential":16} {time.perf_counter() - start:8.3f} s')
+    for readers in args.readers:
+        pipeline = Pipeline(readers=readers, workers=args.workers)
+        start = time.perf_counter()
+        pipeline.run(sources(), io.StringIO())
+        elapsed = time.perf_counter() - start
+        stats = pipeline.stats()
+        print(f'{f"{readers} readers":16} {elapsed:8.3f} s, '
+              f'{total / elapsed:,.0f} packages/s, queue depth max '
+              f'{stats["packages"]["max_depth"]} packages / '
+              f'{stats["messages"]["max_depth"]} messages')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sources', type=int, default=16)
+    parser.add_argument('--blocks', type=int, default=20)
+    parser.add_argument('--block-size', type=int, default=300)
+    parser.add_argument('--latency', type=float, default=0.005)
+    parser.add_argument('--readers', type=int, nargs='+',
+                        default=[1, 4, 16])
+    parser.add_argument('--workers', type=int, default=1)
+    main(parser.parse_args())
@@ -0,0 +1,70 @@
+"""Latency of server.PackageServer under concurrent clients.
+
+Starts the server in-process (or uses --port of a running one), opens
+several connections that send packages one at a time and reports p50
+and p99 round-trip latency.
+
+Usage: python benchmarks/load_test.py [--clients N] [--requests N]
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from server import PackageServer  # noqa: E402
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+
+
+async def client(port, requests, latencies):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    lines = [(json.dumps(package) + '\n').encode() for package in PACKAGES]
+    for index in range(requests):
+        start = time.perf_counter()
+        writer.write(lines[index % len(lines)])
+        await reader.readline()
+        latencies.append(time.perf_counter() - start)
+    writer.write_eof()
+    await reader.read()
+    writer.close()
+
+
+def percentile(values, share):
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+async def main(args):
+    listener = None
+    port = args.port
+    if port is None:
+        listener = await PackageServer().start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*[client(port, args.requests, latencies)
+                           for _ in range(args.clients)])
+    elapsed = time.perf_counter() - start
+    if listener is not None:
+        listener.close()
+    latencies.sort()
+    print(f'{len(latencies)} requests from {args.clients} clients: '
+          f'{len(latencies) / elapsed:,.0f} requests/s, '
+          f'p50 {percentile(latencies, 0.5) * 1e3:.3f} ms, '
+          f'p99 {percentile(latencies, 0.99) * 1e3:.3f} ms')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--port', type=int,
+                        help='port of an already running server')
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,84 @@
+"""Metric calls and time per show_training_info() with the compiled
+formulas, which compute every metric once per workout, and with the
+metric methods, which compute distance and speed again for every
+metric built on them.
+
+Usage: python benchmarks/memoize.py [repeats]
+"""
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import homework  # noqa: E402
+
+TRAINING_TYPES = (homework.Training, homework.Running,
+                  homework.SportsWalking, homework.Swimming)
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+METRICS = ('get_distance', 'get_mean_speed', 'get_spent_calories')
+
+
+def metric_codes():
+    """Maps the code of every metric method and compiled formula to a
+    name to count."""
+    codes = {}
+    for training_class in TRAINING_TYPES:
+        for name in METRICS:
+            method = training_class.__dict__.get(name)
+            if method is not None:
+                codes[method.__code__] = name
+        formulas = training_class.get_formulas()
+        if formulas is not None:
+            codes[formulas[0].__code__] = 'compiled'
+    return codes
+
+
+def count_calls(codes):
+    """Counts executions of metric bodies and compiled formulas for the
+    sample packages."""
+    counts = {}
+
+    def profile(frame, event, arg):
+        if event == 'call' and frame.f_code in codes:
+            name = codes[frame.f_code]
+            counts[name] = counts.get(name, 0) + 1
+
+    sys.setprofile(profile)
+    for package in PACKAGES:
+        homework.read_package(*package).show_training_info()
+    sys.setprofile(None)
+    return counts
+
+
+def run(repeats):
+    """Get back the best time per workout of five rounds."""
+    return min(timeit.repeat(
+        lambda: [homework.read_package(*package).show_training_info()
+                 for package in PACKAGES],
+        number=repeats, repeat=5,
+    )) / (repeats * len(PACKAGES))
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    codes = metric_codes()
+    results = {'compiled': (count_calls(codes), run(repeats))}
+    # get_formulas() gets back None for classes cached so, which makes
+    # show_training_info() call the metric methods.
+    homework.FORMULAS.update(dict.fromkeys(TRAINING_TYPES))
+    try:
+        results['methods'] = (count_calls(codes), run(repeats))
+    finally:
+        homework.FORMULAS.clear()
+    for mode, (counts, seconds) in results.items():
+        print(f'{mode}: {seconds * 1e6:.2f} us per workout, '
+              f'metric calls for {len(PACKAGES)} workouts: {counts}')
+
+
+if __name__ == '__main__':
+    main()
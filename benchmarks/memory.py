@@ -0,0 +1,66 @@
+"""Bytes per record for Training objects versus TrainingBatch rows.
+
+Usage: python benchmarks/memory.py [records]
+"""
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import homework  # noqa: E402
+
+SAMPLES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+
+
+@dataclass
+class DictInfoMessage:
+    """InfoMessage layout before __slots__ were added."""
+
+    training_type: str
+    duration: float
+    distance: float
+    speed: float
+    calories: float
+
+
+def measure(build, count):
+    tracemalloc.start()
+    kept = build(count)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size / count
+
+
+def packages(count):
+    return [SAMPLES[index % len(SAMPLES)] for index in range(count)]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rows = packages(count)
+    cases = {
+        'Training objects': lambda n: [homework.read_package(*package)
+                                       for package in rows],
+        'TrainingBatch rows': lambda n: homework.TrainingBatch(rows),
+        'InfoMessage with __dict__': lambda n: [
+            DictInfoMessage('Running', 1.0, 2.0, 3.0, 4.0)
+            for _ in range(n)
+        ],
+        'InfoMessage with __slots__': lambda n: [
+            homework.InfoMessage('Running', 1.0, 2.0, 3.0, 4.0)
+            for _ in range(n)
+        ],
+    }
+    for name, build in cases.items():
+        print(f'{name}: {measure(build, count):.1f} bytes per record')
+
+
+if __name__ == '__main__':
+    main()
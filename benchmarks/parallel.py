@@ -0,0 +1,55 @@
+"""Throughput of process_packages_parallel for 1..N workers.
+
+Usage: python benchmarks/parallel.py [packages] [max_workers]
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import homework  # noqa: E402
+
+SAMPLES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+
+
+def synthetic_packages(count):
+    """Yields count packages cycling through the sample ones."""
+    while True:
+        for package in SAMPLES:
+            if count <= 0:
+                return
+            count -= 1
+            yield package
+
+
+def run(count, workers):
+    start = time.perf_counter()
+    for _ in homework.process_packages_parallel(
+            synthetic_packages(count), workers=workers):
+        pass
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    max_workers = (int(sys.argv[2]) if len(sys.argv) > 2
+                   else os.cpu_count() or 1)
+    start = time.perf_counter()
+    for _ in homework.process_packages(synthetic_packages(count)):
+        pass
+    serial = count / (time.perf_counter() - start)
+    print(f'serial: {serial:,.0f} packages/s')
+    for workers in range(1, max_workers + 1):
+        throughput = run(count, workers)
+        print(f'workers={workers}: {throughput:,.0f} packages/s '
+              f'(x{throughput / serial:.2f})')
+
+
+if __name__ == '__main__':
+    main()
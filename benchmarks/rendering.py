@@ -0,0 +1,63 @@
+"""InfoMessage rendering: asdict()-based get_message() versus the
+current get_message() and the bulk render_messages().
+
+Usage: python benchmarks/rendering.py [messages]
+"""
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import ClassVar
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import homework  # noqa: E402
+
+
+@dataclass
+class DataclassInfoMessage:
+    """InfoMessage as it was before rendering avoided asdict()."""
+
+    training_type: str
+    duration: float
+    distance: float
+    speed: float
+    calories: float
+
+    TEMPLATE_INFO: ClassVar[str] = homework.InfoMessage.TEMPLATE_INFO
+
+    def get_message(self):
+        return self.TEMPLATE_INFO.format(**asdict(self))
+
+
+def timed(render, messages):
+    start = time.perf_counter()
+    render(messages)
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    messages = [homework.InfoMessage('Running', 1.0, index / 7, 9.75,
+                                     index / 3)
+                for index in range(count)]
+    legacy = [DataclassInfoMessage(message.training_type, message.duration,
+                                   message.distance, message.speed,
+                                   message.calories)
+              for message in messages]
+
+    def join_messages(items):
+        return '\n'.join(message.get_message() for message in items)
+
+    cases = {
+        'asdict get_message': (join_messages, legacy),
+        'get_message': (join_messages, messages),
+        'render_messages': (homework.render_messages, messages),
+    }
+    for name, (render, items) in cases.items():
+        seconds = timed(render, items)
+        print(f'{name}: {count / seconds:,.0f} messages/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Start-up cost of homework.py as a short-lived process.
+
+Reports the modules imported by ``import homework`` with their
+cumulative -X importtime cost, and the median wall time of a one-package
+CLI run next to a bare interpreter. ``python homework.py`` compiles the
+script on every run, while ``python -m homework`` loads the cached
+bytecode (unless PYTHONDONTWRITEBYTECODE is set).
+
+Usage: python benchmarks/startup.py [runs]
+"""
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+HOMEWORK = str(BASE_DIR / 'homework.py')
+
+
+def import_times():
+    """Get back (module, cumulative microseconds) of import homework."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import homework'],
+        cwd=BASE_DIR, capture_output=True, text=True, check=True,
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        times.append((name.rstrip(), int(cumulative)))
+    return times
+
+
+def wall_time(command, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=BASE_DIR, stdout=subprocess.DEVNULL,
+                       check=True)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    times = import_times()
+    print('import homework, cumulative us:')
+    for name, cumulative in times:
+        if not name.startswith('   '):
+            print(f'  {cumulative:8} {name.strip()}')
+    bare = wall_time([sys.executable, '-c', 'pass'], runs)
+    package = ['RUN', '15000', '1', '75']
+    print(f'{"python -c pass":24} {bare * 1e3:7.2f} ms')
+    for name, command in [
+        ('python homework.py ...', [sys.executable, HOMEWORK, *package]),
+        ('python -m homework ...', [sys.executable, '-m', 'homework',
+                                    *package]),
+    ]:
+        cli = wall_time(command, runs)
+        print(f'{name:24} {cli * 1e3:7.2f} ms '
+              f'(+{(cli - bare) * 1e3:.2f} ms)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+"""Benchmarks of every hot path in homework.py.
+
+Each case runs over synthetic packages for every requested size and
+records the best time out of --repeat runs. Results are written as JSON
+so that two runs can be compared with --compare.
+
+Usage:
+    python benchmarks/suite.py [--sizes 3 4 5] [--output results.json]
+    python benchmarks/suite.py --compare old.json new.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from itertools import cycle, islice
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR))
+
+import homework  # noqa: E402
+
+POOL_SIZE = 1000
+
+
+def synthetic_pool(seed=0):
+    """Builds POOL_SIZE random but reproducible packages."""
+    generator = random.Random(seed)
+    pool = []
+    for index in range(POOL_SIZE):
+        action = generator.randint(100, 30000)
+        duration = generator.randint(1, 4) / 2
+        weight = generator.randint(45, 120)
+        if index % 3 == 0:
+            pool.append(('RUN', [action, duration, weight]))
+        elif index % 3 == 1:
+            pool.append(('WLK', [action, duration, weight,
+                                 generator.randint(150, 200)]))
+        else:
+            pool.append(('SWM', [action, duration, weight,
+                                 generator.choice((25, 50)),
+                                 generator.randint(10, 60)]))
+    return pool
+
+
+def repeat_pool(pool, size):
+    """Get back an iterator over size items cycling through the pool."""
+    return islice(cycle(pool), size)
+
+
+def bench_read_package(pool, size):
+    read_package = homework.read_package
+    for workout_type, data in repeat_pool(pool, size):
+        read_package(workout_type, data)
+
+
+def bench_calories(workout_type):
+    def bench(pool, size):
+        trainings = [homework.read_package(*package) for package in pool
+                     if package[0] == workout_type]
+        for training in repeat_pool(trainings, size):
+            training.get_spent_calories()
+    return bench
+
+
+def bench_show_training_info(pool, size):
+    trainings = [homework.read_package(*package) for package in pool]
+    for training in repeat_pool(trainings, size):
+        training.show_training_info()
+
+
+def bench_get_message(pool, size):
+    messages = [homework.read_package(*package).show_training_info()
+                for package in pool]
+    for message in repeat_pool(messages, size):
+        message.get_message()
+
+
+def bench_main(pool, size):
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        for workout_type, data in repeat_pool(pool, size):
+            homework.main(homework.read_package(workout_type, data))
+            if out.tell() > 1 << 24:
+                out.seek(0)
+                out.truncate()
+
+
+CASES = {
+    'read_package': bench_read_package,
+    'Running.get_spent_calories': bench_calories('RUN'),
+    'SportsWalking.get_spent_calories': bench_calories('WLK'),
+    'Swimming.get_spent_calories': bench_calories('SWM'),
+    'show_training_info': bench_show_training_info,
+    'InfoMessage.get_message': bench_get_message,
+    'main': bench_main,
+}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, repeat, cases):
+    pool = synthetic_pool()
+    results = {}
+    for name in cases:
+        results[name] = {}
+        for size in sizes:
+            best = min(timed(CASES[name], pool, size)
+                       for _ in range(repeat))
+            results[name][str(size)] = {
+                'seconds': best,
+                'ns_per_op': best / size * 1e9,
+            }
+            print(f'{name:34} {size:>10,} '
+                  f'{best / size * 1e9:10.1f} ns/op', file=sys.stderr)
+    return {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+
+
+def timed(bench, pool, size):
+    start = time.perf_counter()
+    bench(pool, size)
+    return time.perf_counter() - start
+
+
+def compare(old_path, new_path):
+    with open(old_path) as old_file, open(new_path) as new_file:
+        old = json.load(old_file)
+        new = json.load(new_file)
+    print(f'{old["commit"]} -> {new["commit"]}')
+    for name, sizes in new['results'].items():
+        for size, result in sizes.items():
+            before = old['results'].get(name, {}).get(size)
+            if before is None:
+                continue
+            ratio = result['ns_per_op'] / before['ns_per_op']
+            print(f'{name:34} {int(size):>10,} '
+                  f'{before["ns_per_op"]:10.1f} -> '
+                  f'{result["ns_per_op"]:10.1f} ns/op  x{ratio:.2f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[3, 4, 5],
+                        help='powers of ten of the workload sizes '
+                             '(3..7)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--case', action='append', choices=list(CASES),
+                        help='run only the given cases')
+    parser.add_argument('--output', help='file to write JSON results to')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'))
+    args = parser.parse_args()
+    if args.compare:
+        compare(*args.compare)
+        return
+    report = run([10 ** power for power in args.sizes], args.repeat,
+                 args.case or list(CASES))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as output:
+            output.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Decoding throughput: CSV text versus memory-mapped binary records.
+
+Usage: python benchmarks/wire_format.py [packages]
+"""
+import sys
+import tempfile
+import time
+from itertools import cycle, islice
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import homework  # noqa: E402
+import wire  # noqa: E402
+
+SAMPLES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+
+
+def timed(name, count, function):
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    print(f'{name}: {count / elapsed:,.0f} packages/s')
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    packages = list(islice(cycle(SAMPLES), count))
+    with tempfile.TemporaryDirectory() as directory:
+        text_path = Path(directory) / 'packages.csv'
+        binary_path = Path(directory) / 'packages.bin'
+        with open(text_path, 'w', encoding='utf-8') as out:
+            for workout_type, data in packages:
+                out.write(','.join([workout_type, *map(str, data)]) + '\n')
+        with open(binary_path, 'wb') as out:
+            wire.write_packages(packages, out)
+
+        def text_trainings():
+            with open(text_path, encoding='utf-8') as source:
+                for package in homework.read_packages(source):
+                    homework.read_package(*package).show_training_info()
+
+        def text_batch():
+            with open(text_path, encoding='utf-8') as source:
+                homework.TrainingBatch(
+                    homework.read_packages(source)
+                ).calculate()
+
+        def binary_trainings():
+            with wire.PackageFile(str(binary_path)) as package_file:
+                for training in package_file:
+                    training.show_training_info()
+
+        def binary_batch():
+            with wire.PackageFile(str(binary_path)) as package_file:
+                package_file.calculate()
+
+        timed('CSV -> Training', count, text_trainings)
+        timed('CSV -> TrainingBatch.calculate', count, text_batch)
+        timed('records -> Training', count, binary_trainings)
+        timed('records -> calculate_batch', count, binary_batch)
+
+
+if __name__ == '__main__':
+    main()
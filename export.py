@@ -0,0 +1,209 @@
+"""Bulk writers of InfoMessage results for analytics.
+
+Every writer stores the five InfoMessage fields with numbers as raw
+floats, taking messages (or ready columns) in chunks, so that the
+formatting is done per chunk by csv, str.join and array rather than by
+Python code per value.
+
+* CsvWriter - a header line, then a row per message;
+* JsonLinesWriter - a JSON object per line;
+* ColumnarWriter - blocks of columns in a compact binary layout, read
+  back with read_columnar().
+
+Usage:
+    with open('results.csv', 'w', newline='') as out:
+        CsvWriter(out).write(messages)
+"""
+from __future__ import annotations
+
+import csv
+import json
+import struct
+import sys
+from array import array
+from itertools import islice
+from operator import attrgetter
+from typing import (TYPE_CHECKING, BinaryIO, Dict, Iterable, Iterator, List,
+                    Sequence, TextIO, Union)
+
+from homework import InfoMessage
+
+if TYPE_CHECKING:
+    ColumnsChunk = Dict[str, Sequence[Union[str, float]]]
+
+FIELDS = ('training_type', 'duration', 'distance', 'speed', 'calories')
+NUMERIC_FIELDS = FIELDS[1:]
+MAGIC = b'HWCOL1\n'
+BLOCK_HEADER = struct.Struct('<IB')
+NAME_LENGTH = struct.Struct('<B')
+INFINITY = float('inf')
+NON_FINITE_TOKENS = ('": inf', '": -inf', '": nan')
+
+
+class BulkWriter:
+    """Base class of writers consuming messages chunk by chunk."""
+
+    def __init__(self, out, chunk_size: int = 65536) -> None:
+        self.out = out
+        self.chunk_size = chunk_size
+        self.rows = 0
+
+    def write(self, messages: Iterable[InfoMessage]) -> int:
+        """Writes messages, get back the number of rows written so far."""
+        values = attrgetter(*FIELDS)
+        messages = iter(messages)
+        while True:
+            chunk = [values(message)
+                     for message in islice(messages, self.chunk_size)]
+            if not chunk:
+                return self.rows
+            self.write_rows(chunk)
+            self.rows += len(chunk)
+
+    def write_columns(self, columns: ColumnsChunk) -> int:
+        """Writes rows given as a column per field, for instance the
+        result of calculate_batch() with training types and durations."""
+        size = len(columns['training_type'])
+        for start in range(0, size, self.chunk_size):
+            chunk = {name: columns[name][start:start + self.chunk_size]
+                     for name in FIELDS}
+            self.write_column_chunk(chunk)
+            self.rows += len(chunk['training_type'])
+        return self.rows
+
+    def write_column_chunk(self, chunk: ColumnsChunk) -> None:
+        self.write_rows(list(zip(*[chunk[name] for name in FIELDS])))
+
+    def write_rows(self, rows: List[tuple]) -> None:
+        raise NotImplementedError(f'Define write_rows in '
+                                  f'{self.__class__.__name__} class')
+
+
+class CsvWriter(BulkWriter):
+    """Writes a CSV header and a row per message. The output file has
+    to be opened with newline=''."""
+
+    def __init__(self, out: TextIO, chunk_size: int = 65536) -> None:
+        super().__init__(out, chunk_size)
+        self.writer = csv.writer(out, lineterminator='\n')
+        self.writer.writerow(FIELDS)
+
+    def write_rows(self, rows: List[tuple]) -> None:
+        self.writer.writerows(rows)
+
+
+class JsonLinesWriter(BulkWriter):
+    """Writes a JSON object per message. JSON has no infinity or NaN, so
+    a message with such a value raises ValueError, as json.dumps() does
+    with allow_nan=False."""
+
+    def __init__(self, out: TextIO, chunk_size: int = 65536) -> None:
+        super().__init__(out, chunk_size)
+        self.template = ('{' + ', '.join(
+            [f'"{FIELDS[0]}": %s']
+            + [f'"{name}": %r' for name in NUMERIC_FIELDS]
+        ) + '}')
+        self.names: Dict[str, str] = {}
+
+    def write_rows(self, rows: List[tuple]) -> None:
+        names = self.names
+        template = self.template
+        lines = []
+        for row in rows:
+            name = names.get(row[0])
+            if name is None:
+                name = names[row[0]] = json.dumps(row[0], ensure_ascii=False)
+            lines.append(template % (name, *row[1:]))
+        lines.append('')
+        text = '\n'.join(lines)
+        # %r writes infinities and NaN as inf, -inf and nan. Searching the
+        # chunk for them is cheaper than testing every value.
+        if any(token in text for token in NON_FINITE_TOKENS):
+            for row in rows:
+                if not all(-INFINITY < value < INFINITY
+                           for value in row[1:]):
+                    raise ValueError(f'Out of range float values are not '
+                                     f'JSON compliant: {row!r}')
+        self.out.write(text)
+
+
+class ColumnarWriter(BulkWriter):
+    """Writes blocks of columns.
+
+    The file starts with MAGIC. Each block holds its row count and the
+    number of distinct training types, the type names (length-prefixed
+    UTF-8), a byte per row indexing into these names, then each numeric
+    field as little-endian float64 values.
+    """
+
+    def __init__(self, out: BinaryIO, chunk_size: int = 65536) -> None:
+        super().__init__(out, chunk_size)
+        out.write(MAGIC)
+
+    def write_rows(self, rows: List[tuple]) -> None:
+        columns = list(zip(*rows))
+        self.write_column_chunk(dict(zip(FIELDS, columns)))
+
+    def write_column_chunk(self, chunk: ColumnsChunk) -> None:
+        names: Dict[str, int] = {}
+        codes = array('B', [names.setdefault(name, len(names))
+                            for name in chunk['training_type']])
+        parts = [BLOCK_HEADER.pack(len(codes), len(names))]
+        for name in names:
+            encoded = name.encode()
+            parts.append(NAME_LENGTH.pack(len(encoded)) + encoded)
+        parts.append(codes.tobytes())
+        for field in NUMERIC_FIELDS:
+            values = array('d', chunk[field])
+            if sys.byteorder == 'big':
+                values.byteswap()
+            parts.append(values.tobytes())
+        self.out.write(b''.join(parts))
+
+
+def read_columnar(source: BinaryIO) -> Iterator[Dict[str, list]]:
+    """Yields the columns of every block written by ColumnarWriter."""
+    if source.read(len(MAGIC)) != MAGIC:
+        raise ValueError('Not a columnar results file')
+    while True:
+        header = source.read(BLOCK_HEADER.size)
+        if not header:
+            return
+        size, name_count = BLOCK_HEADER.unpack(header)
+        names = []
+        for _ in range(name_count):
+            length, = NAME_LENGTH.unpack(source.read(NAME_LENGTH.size))
+            names.append(source.read(length).decode())
+        codes = array('B', source.read(size))
+        block: Dict[str, list] = {
+            'training_type': [names[code] for code in codes]
+        }
+        for field in NUMERIC_FIELDS:
+            values = array('d')
+            values.frombytes(source.read(size * values.itemsize))
+            if sys.byteorder == 'big':
+                values.byteswap()
+            block[field] = values.tolist()
+        yield block
+
+
+WRITERS = {
+    'csv': CsvWriter,
+    'jsonl': JsonLinesWriter,
+    'col': ColumnarWriter,
+}
+
+
+def export(messages: Iterable[InfoMessage], path: str) -> int:
+    """Writes messages to path in the format given by its extension
+    (.csv, .jsonl or .col), get back the number of rows."""
+    extension = path.rsplit('.', 1)[-1]
+    if extension not in WRITERS:
+        raise ValueError(f'Unknown results format {extension}. '
+                         f'Try to use one of:{tuple(WRITERS)}')
+    writer_class = WRITERS[extension]
+    if writer_class is ColumnarWriter:
+        with open(path, 'wb') as out:
+            return writer_class(out).write(messages)
+    with open(path, 'w', encoding='utf-8', newline='') as out:
+        return writer_class(out).write(messages)
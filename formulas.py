@@ -0,0 +1,293 @@
+"""Specialization of the metric methods of training classes.
+
+compile_formulas() reads get_distance(), get_mean_speed() and
+get_spent_calories() of a class from their source and inlines their
+bodies one after another into a flat function:
+
+* attributes of the training become locals read once;
+* numeric class constants are folded in as literals, other class
+  constants are bound as locals of a closure;
+* calls of a metric method computed before become its local.
+
+Methods doing more than assignments and a return (branches, loops,
+calls of other methods of the training) are not specialized, and the
+training class is calculated by its methods.
+
+homework.py imports this module only once a class is calculated, so
+that short-lived processes don't pay for importing ast.
+
+Usage:
+    calculate, calculate_columns, overrides = compile_formulas(Running)
+    distance, speed, calories = calculate(Running(15000, 1, 75))
+"""
+import ast
+import linecache
+from copy import deepcopy
+from types import FunctionType
+from typing import (TYPE_CHECKING, Callable, Dict, FrozenSet, List,
+                    Optional, Set, Tuple, Type)
+
+if TYPE_CHECKING:
+    from homework import Training
+
+Formulas = Tuple[Callable, Optional[Callable], FrozenSet[str]]
+# Metric and the method computing it, in the order they build on each
+# other.
+METRIC_METHODS = (
+    ('distance', 'get_distance'),
+    ('speed', 'get_mean_speed'),
+    ('calories', 'get_spent_calories'),
+)
+LITERAL_TYPES = frozenset((int, float))
+NESTED_SCOPES = (ast.Lambda, ast.ListComp, ast.SetComp, ast.DictComp,
+                 ast.GeneratorExp, ast.NamedExpr, ast.Await, ast.Yield,
+                 ast.YieldFrom)
+SOURCE = '''
+def specialize({constants}):
+    def calculate(training):
+{loads}
+        pass
+        return distance, speed, calories
+
+    def calculate_columns({columns}):
+        distance_column, speed_column, calories_column = [], [], []
+        for {targets}, in zip({columns}):
+            pass
+            distance_column.append(distance)
+            speed_column.append(speed)
+            calories_column.append(calories)
+        return distance_column, speed_column, calories_column
+
+    return calculate, {calculate_columns}
+'''
+
+
+class NotInlined(Exception):
+    """Raised for a method body that can't be inlined."""
+
+
+def method_definition(method: Callable) -> Optional[ast.FunctionDef]:
+    """Get back the syntax tree of a function read from its source
+    file, or None if the source can't be found."""
+    code = getattr(method, '__code__', None)
+    if code is None:
+        return None
+    lines = linecache.getlines(code.co_filename, method.__globals__)
+    first = code.co_firstlineno - 1
+    if first >= len(lines):
+        return None
+    indent = len(lines[first]) - len(lines[first].lstrip())
+    block = [lines[first]]
+    for line in lines[first + 1:]:
+        if line.strip() and len(line) - len(line.lstrip()) <= indent:
+            break
+        block.append(line)
+    try:
+        module = ast.parse(''.join(line[indent:] for line in block))
+    except SyntaxError:
+        return None
+    definition = module.body[0]
+    if (not isinstance(definition, ast.FunctionDef)
+            or definition.name != code.co_name):
+        return None
+    return definition
+
+
+def method_body(definition: ast.FunctionDef) -> List[ast.stmt]:
+    """Get back the statements of a method taking only self, without
+    its docstring, checking they are assignments and a return."""
+    arguments = definition.args
+    if (len(arguments.args) != 1 or arguments.posonlyargs
+            or arguments.vararg or arguments.kwonlyargs or arguments.kwarg):
+        raise NotInlined('the method takes arguments')
+    body = list(definition.body)
+    if ast.get_docstring(definition, clean=False) is not None:
+        body = body[1:]
+    if not body or not isinstance(body[-1], ast.Return) or (
+        body[-1].value is None
+    ):
+        raise NotInlined('the method does not end with a return')
+    for index, statement in enumerate(body[:-1]):
+        if isinstance(statement, ast.AnnAssign) and statement.value:
+            body[index] = ast.Assign([statement.target], statement.value)
+        elif not isinstance(statement, (ast.Assign, ast.AugAssign)):
+            raise NotInlined(f'{statement.__class__.__name__} statement')
+    return body
+
+
+def assigned_names(statements: List[ast.stmt]) -> Set[str]:
+    """Get back the local variables the assignments store to."""
+    names = set()
+    for statement in statements:
+        targets = getattr(statement, 'targets', None) or [statement.target]
+        for node in ast.walk(ast.Tuple(targets, ast.Store())):
+            if isinstance(node, ast.Name):
+                names.add(node.id)
+            elif not isinstance(node, (ast.Tuple, ast.List, ast.Starred,
+                                       ast.expr_context)):
+                raise NotInlined('the method assigns to an attribute')
+    return names
+
+
+class MetricInliner(ast.NodeTransformer):
+    """Rewrites the body of a metric method into statements assigning
+    the metric to a local variable.
+
+    Attributes of the instance become locals named self_<attribute>,
+    numeric class constants literals, other class constants locals
+    named const_<attribute>, and calls of the metric methods in computed
+    the local of their metric. The attributes and constants read are
+    collected on the inliner.
+    """
+
+    def __init__(self,
+                 training_class: type,
+                 metric: str,
+                 method: Callable,
+                 computed: Dict[str, str]
+                 ) -> None:
+        self.training_class = training_class
+        self.metric = metric
+        self.method = method
+        self.computed = computed
+        self.self_name = ''
+        self.local_names: Set[str] = set()
+        self.attributes: Set[str] = set()
+        self.constants: Dict[str, object] = {}
+        self.uses_globals = False
+
+    def inline(self) -> List[ast.stmt]:
+        definition = method_definition(self.method)
+        if definition is None:
+            raise NotInlined('the source of the method is not found')
+        body = method_body(definition)
+        self.self_name = definition.args.args[0].arg
+        self.local_names = assigned_names(body[:-1])
+        statements = [self.visit(statement) for statement in body[:-1]]
+        statements.append(ast.Assign([ast.Name(self.metric, ast.Store())],
+                                     self.visit(body[-1].value)))
+        return statements
+
+    def is_self_attribute(self, node: ast.AST) -> bool:
+        return (isinstance(node, ast.Attribute)
+                and isinstance(node.value, ast.Name)
+                and node.value.id == self.self_name)
+
+    def generic_visit(self, node: ast.AST) -> ast.AST:
+        if isinstance(node, NESTED_SCOPES):
+            raise NotInlined(f'{node.__class__.__name__} expression')
+        return super().generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        if (self.is_self_attribute(node.func)
+                and node.func.attr in self.computed
+                and not node.args and not node.keywords):
+            return ast.Name(self.computed[node.func.attr], ast.Load())
+        return self.generic_visit(node)
+
+    def visit_Attribute(self, node: ast.Attribute) -> ast.AST:
+        if not self.is_self_attribute(node):
+            return self.generic_visit(node)
+        if not isinstance(node.ctx, ast.Load):
+            raise NotInlined(f'{node.attr} is assigned')
+        name = node.attr
+        owner = next((klass for klass in self.training_class.__mro__
+                      if name in klass.__dict__), None)
+        if owner is None:
+            self.attributes.add(name)
+            return ast.Name(f'self_{name}', ast.Load())
+        value = owner.__dict__[name]
+        if hasattr(value.__class__, '__get__'):
+            raise NotInlined(f'{name} is not a constant')
+        self.constants[name] = value
+        if value.__class__ in LITERAL_TYPES:
+            return ast.Constant(value)
+        return ast.Name(f'const_{name}', ast.Load())
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        if node.id in (self.self_name, 'super'):
+            raise NotInlined(f'{node.id} is used as a whole')
+        if node.id in self.local_names:
+            return ast.Name(f'{self.metric}_{node.id}', node.ctx)
+        if node.id in self.method.__globals__:
+            self.uses_globals = True
+        return node
+
+
+def specialize_source(statements: List[ast.stmt],
+                      arguments: List[str],
+                      attributes: Set[str],
+                      fields: Tuple[str, ...]
+                      ) -> ast.Module:
+    """Get back the module defining specialize(), the closure making
+    calculate() and calculate_columns() out of the inlined statements.
+    calculate_columns is None unless every attribute read is a package
+    value."""
+    module = ast.parse(SOURCE.format(
+        constants=', '.join(f'const_{name}' for name in arguments),
+        loads='\n'.join(f'        self_{name} = training.{name}'
+                        for name in sorted(attributes)),
+        columns=', '.join(f'{name}_column' for name in fields),
+        targets=', '.join(f'self_{name}' for name in fields),
+        calculate_columns=('calculate_columns' if attributes <= set(fields)
+                           else 'None'),
+    ))
+    for node in ast.walk(module):
+        body = getattr(node, 'body', None)
+        if isinstance(body, list):
+            body[:] = [
+                item for statement in body for item in (
+                    deepcopy(statements) if isinstance(statement, ast.Pass)
+                    else [statement]
+                )
+            ]
+    return ast.fix_missing_locations(module)
+
+
+def compile_formulas(training_class: Type['Training']
+                     ) -> Optional[Formulas]:
+    """Specializes the metric methods of a training class into flat
+    functions, or get back None if a method can't be specialized.
+
+    The first function takes a training object, the second takes a
+    column per package value and returns three columns; it is None if
+    the methods read attributes that are not package values. The third
+    item holds the names of the metric methods and class constants the
+    functions stand for: a training object overriding any of them has to
+    be calculated by its methods.
+    """
+    statements: List[ast.stmt] = []
+    attributes: Set[str] = set()
+    constants: Dict[str, object] = {}
+    namespaces = []
+    computed: Dict[str, str] = {}
+    for metric, method_name in METRIC_METHODS:
+        method = getattr(training_class, method_name)
+        inliner = MetricInliner(training_class, metric, method, computed)
+        try:
+            statements.extend(inliner.inline())
+        except NotInlined:
+            return None
+        attributes |= inliner.attributes
+        constants.update(inliner.constants)
+        if inliner.uses_globals:
+            namespaces.append(method.__globals__)
+        computed[method_name] = metric
+    if any(namespace is not namespaces[0] for namespace in namespaces):
+        return None
+    arguments = sorted(name for name, value in constants.items()
+                       if value.__class__ not in LITERAL_TYPES)
+    module = specialize_source(statements, arguments, attributes,
+                               training_class.get_fields())
+    namespace: Dict[str, object] = {}
+    exec(compile(module, f'<{training_class.__name__} formulas>', 'exec'),
+         namespace)
+    specialize = namespace['specialize']
+    if namespaces:
+        # Names of the module of the methods are looked up when called.
+        specialize = FunctionType(specialize.__code__, namespaces[0])
+    calculate, calculate_columns = specialize(
+        *[constants[name] for name in arguments]
+    )
+    return (calculate, calculate_columns,
+            frozenset(constants).union(name for _, name in METRIC_METHODS))
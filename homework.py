@@ -1,32 +1,184 @@
-from dataclasses import dataclass, asdict
-from typing import Dict, List, Tuple, Type
+from __future__ import annotations
+
+import os
+import sys
+from array import array
+from collections import OrderedDict, deque
+from io import StringIO
+from itertools import islice
+from operator import attrgetter
+
+# The module is started as a short-lived process, so typing, json,
+# string and concurrent.futures are only imported where they are needed.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import (ClassVar, Dict, Iterable, Iterator, List, Optional,
+                        Sequence, TextIO, Tuple, Type, Union)
+
+    from formulas import Formulas
+
+    Columns = Dict[str, Sequence[float]]
+    MetricColumns = Tuple[List[float], List[float], List[float]]
+    Package = Tuple[str, List[Union[int, float]]]
 
 
-@dataclass
 class InfoMessage:
     """Generates a message about training."""
+    __slots__ = ('training_type', 'duration', 'distance', 'speed', 'calories')
 
-    training_type: str
-    duration: float
-    distance: float
-    speed: float
-    calories: float
+    TEMPLATE_INFO: ClassVar[str] = (
+        'Тип тренировки: {training_type}; '
+        'Длительность: {duration:.3f} ч.; '
+        'Дистанция: {distance:.3f} км; '
+        'Ср. скорость: {speed:.3f} км/ч; '
+        'Потрачено ккал: {calories:.3f}.'
+    )
 
-    TEMPLATE_INFO: str = ('Тип тренировки: {training_type}; '
-                          'Длительность: {duration:.3f} ч.; '
-                          'Дистанция: {distance:.3f} км; '
-                          'Ср. скорость: {speed:.3f} км/ч; '
-                          'Потрачено ккал: {calories:.3f}.')
+    def __init__(self,
+                 training_type: str,
+                 duration: float,
+                 distance: float,
+                 speed: float,
+                 calories: float,
+                 ) -> None:
+        self.training_type = training_type
+        self.duration = duration
+        self.distance = distance
+        self.speed = speed
+        self.calories = calories
+
+    def __repr__(self) -> str:
+        return (f'{self.__class__.__name__}('
+                f'training_type={self.training_type!r}, '
+                f'duration={self.duration!r}, '
+                f'distance={self.distance!r}, '
+                f'speed={self.speed!r}, '
+                f'calories={self.calories!r})')
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.training_type, self.duration, self.distance,
+                self.speed, self.calories) == (
+            other.training_type, other.duration, other.distance,
+            other.speed, other.calories)
+
+    __hash__ = None  # type: ignore[assignment]
 
     def get_message(self) -> str:
-        return self.TEMPLATE_INFO.format(**asdict(self))
-
-
-class Training:
-    """Base class of training."""
+        return self.TEMPLATE_INFO.format(training_type=self.training_type,
+                                         duration=self.duration,
+                                         distance=self.distance,
+                                         speed=self.speed,
+                                         calories=self.calories)
+
+
+def printf_template(template: str) -> Tuple[str, Tuple[str, ...]]:
+    """Converts a str.format template into a %-style one.
+
+    Get back the new template and the names of the fields in the order
+    they have to be passed to it.
+    """
+    from string import Formatter
+
+    parts = []
+    names = []
+    for literal, name, spec, _ in Formatter().parse(template):
+        parts.append(literal.replace('%', '%%'))
+        if name is not None:
+            parts.append('%' + (spec or 's'))
+            names.append(name)
+    return ''.join(parts), tuple(names)
+
+
+def write_messages(messages: Iterable[InfoMessage],
+                   out: TextIO,
+                   chunk_size: int = 1024
+                   ) -> None:
+    """Writes messages to out one per line, chunk_size lines per write.
+
+    Produces the same text as get_message(), but formats through a
+    %-style copy of TEMPLATE_INFO, which is much cheaper per message.
+    """
+    template, names = printf_template(InfoMessage.TEMPLATE_INFO)
+    values = attrgetter(*names)
+    messages = iter(messages)
+    while True:
+        lines = [template % values(message)
+                 for message in islice(messages, chunk_size)]
+        if not lines:
+            return
+        lines.append('')
+        out.write('\n'.join(lines))
+
+
+def render_messages(messages: Iterable[InfoMessage]) -> str:
+    """Get back messages rendered one per line."""
+    out = StringIO()
+    write_messages(messages, out)
+    return out.getvalue()
+
+
+TRAINING_TYPES: Dict[str, Type['Training']] = {}
+NUMBER_TYPES = frozenset((int, float))
+FORMULAS: Dict[type, Optional[Formulas]] = {}
+# Specializing a class costs about 16 ms the first time (importing ast),
+# and saves well under a microsecond a workout, so show_training_info()
+# only specializes a class once it has calculated that many workouts.
+SPECIALIZE_AFTER = 10000
+WORKOUTS: Dict[type, int] = {}
+
+
+class TrainingType(type):
+    """Metaclass of trainings dropping the compiled formulas of a class
+    and its subclasses whenever a class attribute (a constant or a
+    metric method) is changed."""
+
+    def __setattr__(cls, name: str, value) -> None:
+        super().__setattr__(name, value)
+        cls.drop_formulas()
+
+    def __delattr__(cls, name: str) -> None:
+        super().__delattr__(name)
+        cls.drop_formulas()
+
+    def drop_formulas(cls) -> None:
+        for klass in [klass for klass in FORMULAS if issubclass(klass, cls)]:
+            del FORMULAS[klass]
+
+
+class Training(metaclass=TrainingType):
+    """Base class of training.
+
+    Subclasses become available to read_package() by passing their
+    workout type code to the class statement:
+    ``class Cycling(Training, code='CYC')``.
+
+    show_training_info() and calculate_batch() run the metric methods
+    specialized into a single flat function by formulas.py.
+    """
     M_IN_KM: int = 1000
     LEN_STEP: float = 0.65
     MIN_IN_HOUR: int = 60
+    CODE: ClassVar[Optional[str]] = None
+    ARITY: ClassVar[int] = 3
+    POSITIVE_FIELDS: ClassVar[Tuple[str, ...]] = ('duration', 'weight')
+    SCHEMA: ClassVar[Tuple[Tuple[str, bool], ...]] = (
+        ('action', False), ('duration', True), ('weight', True)
+    )
+
+    def __init_subclass__(cls, code: Optional[str] = None, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.ARITY = len(cls.get_fields())
+        cls.SCHEMA = tuple((name, name in cls.POSITIVE_FIELDS)
+                           for name in cls.get_fields())
+        if code is None:
+            return
+        if code in TRAINING_TYPES:
+            raise ValueError(f'WORKOUT_TYPE {code} is already used by '
+                             f'{TRAINING_TYPES[code].__name__}')
+        cls.CODE = code
+        TRAINING_TYPES[code] = cls
 
     def __init__(self,
                  action: int,
@@ -48,6 +200,40 @@ class Training:
         speed = self.get_distance() / self.duration
         return speed
 
+    @classmethod
+    def get_fields(cls) -> Tuple[str, ...]:
+        """Get back names of the package values the class is built from."""
+        code = cls.__init__.__code__
+        return code.co_varnames[1:code.co_argcount]
+
+    @classmethod
+    def check_values(cls, data: Sequence[float]) -> Optional[str]:
+        """Get back why the package values can't make a training of
+        this class, or None if they can.
+
+        Every value has to be a finite non-negative number, and the ones
+        named in POSITIVE_FIELDS have to be greater than zero.
+        """
+        if not isinstance(data, (list, tuple)):
+            return f'package values must be a list, got {data!r}'
+        if len(data) != cls.ARITY:
+            return (f'{cls.__name__} needs {cls.ARITY} values '
+                    f'{cls.get_fields()}, got {len(data)}')
+        for (name, positive), value in zip(cls.SCHEMA, data):
+            if value.__class__ not in NUMBER_TYPES:
+                return f'{name} must be a number, got {value!r}'
+            if positive and not value > 0:
+                return f'{name} must be positive, got {value!r}'
+            if not value >= 0:
+                return f'{name} must not be negative, got {value!r}'
+            try:
+                finite = float(value) < float('inf')
+            except OverflowError:
+                finite = False
+            if not finite:
+                return f'{name} must be finite, got {value!r}'
+        return None
+
     def get_spent_calories(self) -> float:
         """Calculates the number of calories burned in a workout
         based on the type of workout"""
@@ -55,18 +241,60 @@ class Training:
                                   f'{self.__class__.__name__} class'
                                   )
 
+    @classmethod
+    def get_formulas(cls) -> Optional[Formulas]:
+        """Get back the compiled formulas of the class, if it has them."""
+        if cls in FORMULAS:
+            return FORMULAS[cls]
+        from formulas import compile_formulas
+
+        formulas = FORMULAS[cls] = compile_formulas(cls)
+        return formulas
+
+    @classmethod
+    def count_workout(cls) -> Optional[Formulas]:
+        """Counts a workout calculated by the metric methods, get back
+        the formulas once the class has calculated SPECIALIZE_AFTER."""
+        count = WORKOUTS[cls] = WORKOUTS.get(cls, 0) + 1
+        if count < SPECIALIZE_AFTER:
+            return None
+        return cls.get_formulas()
+
     def show_training_info(self) -> InfoMessage:
         """Get back info message about training."""
+        formulas = FORMULAS.get(self.__class__)
+        if formulas is None and self.__class__ not in FORMULAS:
+            formulas = self.count_workout()
+        if formulas is None or not formulas[2].isdisjoint(self.__dict__):
+            distance = self.get_distance()
+            speed = self.get_mean_speed()
+            calories = self.get_spent_calories()
+        else:
+            distance, speed, calories = formulas[0](self)
         return InfoMessage(
             training_type=self.__class__.__name__,
             duration=self.duration,
-            distance=self.get_distance(),
-            speed=self.get_mean_speed(),
-            calories=self.get_spent_calories()
+            distance=distance,
+            speed=speed,
+            calories=calories
         )
 
-
-class Running(Training):
+    @classmethod
+    def calculate_columns(cls, columns: Columns) -> MetricColumns:
+        """Calculates distance, speed and calories column by column,
+        building a training per row if the class has no formulas for
+        columns."""
+        values = [columns[name] for name in cls.get_fields()]
+        formulas = cls.get_formulas()
+        if formulas is not None and formulas[1] is not None:
+            return formulas[1](*values)
+        trainings = [cls(*row) for row in zip(*values)]
+        return ([training.get_distance() for training in trainings],
+                [training.get_mean_speed() for training in trainings],
+                [training.get_spent_calories() for training in trainings])
+
+
+class Running(Training, code='RUN'):
     """Training: run."""
     RUN_COEFF_CALORIE_1: float = 18
     RUN_COEFF_CALORIE_2: float = 20
@@ -79,10 +307,11 @@ class Running(Training):
         return calories
 
 
-class SportsWalking(Training):
+class SportsWalking(Training, code='WLK'):
     """Training: sports walking."""
     WLK_COEFF_CALORIE_1: float = 0.035
     WLK_COEFF_CALORIE_2: float = 0.029
+    POSITIVE_FIELDS = Training.POSITIVE_FIELDS + ('height',)
 
     def __init__(self,
                  action,
@@ -104,7 +333,7 @@ class SportsWalking(Training):
         return calories
 
 
-class Swimming(Training):
+class Swimming(Training, code='SWM'):
     """Training: swimming."""
     LEN_STEP: float = 1.38
     SWM_COEFF_CALORIE_1: float = 1.1
@@ -142,19 +371,325 @@ class Swimming(Training):
         return calories
 
 
+def package_error(workout_type: str,
+                  data: Optional[Sequence[float]] = None
+                  ) -> ValueError:
+    """Get back the error describing why a package can't be read."""
+    training_class = TRAINING_TYPES.get(workout_type)
+    if training_class is None:
+        return ValueError(f'Sorry, but {workout_type} wrong name '
+                          f'WORKOUT_TYPE. '
+                          f'Try to use one of:{tuple(TRAINING_TYPES)}'
+                          )
+    return ValueError(f'{workout_type} package must contain '
+                      f'{training_class.ARITY} values '
+                      f'{training_class.get_fields()}, '
+                      f'got {len(data or ())}'
+                      )
+
+
+def get_training_class(workout_type: str) -> Type[Training]:
+    """Get back the training class registered for the workout type."""
+    training_class = TRAINING_TYPES.get(workout_type)
+    if training_class is None:
+        raise package_error(workout_type)
+    return training_class
+
+
+def check_package(workout_type: str, data: Sequence[float]) -> Optional[str]:
+    """Get back why the package can't be read, or None if it can."""
+    if not isinstance(workout_type, str):
+        return f'WORKOUT_TYPE must be a string, got {workout_type!r}'
+    training_class = TRAINING_TYPES.get(workout_type)
+    if training_class is None:
+        return f'unknown WORKOUT_TYPE {workout_type!r}'
+    return training_class.check_values(data)
+
+
+def validate_packages(packages: Iterable[Package],
+                      rejects: List[Tuple[Package, str]]
+                      ) -> Iterator[Package]:
+    """Yields the packages that read_package() accepts and appends the
+    others with the reason to rejects, without raising exceptions."""
+    for package in packages:
+        reason = check_package(*package)
+        if reason is None:
+            yield package
+        else:
+            rejects.append((package, reason))
+
+
 def read_package(workout_type: str, data: List[int]) -> Training:
     """Reads data from sensors and converts them into a dictionary."""
-    training_name: Dict[str, Type[Training]] = {
-        'SWM': Swimming,
-        'RUN': Running,
-        'WLK': SportsWalking
+    training_class = TRAINING_TYPES.get(workout_type)
+    if training_class is None or len(data) != training_class.ARITY:
+        raise package_error(workout_type, data)
+    return training_class(*data)
+
+
+def calculate_batch(workout_types: Sequence[str],
+                    action: Sequence[int],
+                    duration: Sequence[float],
+                    weight: Sequence[float],
+                    height: Optional[Sequence[float]] = None,
+                    length_pool: Optional[Sequence[float]] = None,
+                    count_pool: Optional[Sequence[float]] = None,
+                    ) -> MetricColumns:
+    """Calculates distance, speed and calories for whole columns of
+    packages at once, grouping the rows by workout type."""
+    size = len(workout_types)
+    source: Dict[str, Optional[Sequence[float]]] = {
+        'action': action,
+        'duration': duration,
+        'weight': weight,
+        'height': height,
+        'length_pool': length_pool,
+        'count_pool': count_pool,
     }
-    if workout_type not in training_name:
-        training_name_keys = tuple(training_name)
-        raise ValueError(f'Sorry, but {workout_type} wrong name WORKOUT_TYPE. '
-                         f'Try to use one of:{training_name_keys}'
-                         )
-    return training_name[workout_type](*data)
+    rows: Dict[str, List[int]] = {}
+    for index, workout_type in enumerate(workout_types):
+        rows.setdefault(workout_type, []).append(index)
+
+    distance = [0.0] * size
+    speed = [0.0] * size
+    calories = [0.0] * size
+    for workout_type, indexes in rows.items():
+        training_class = get_training_class(workout_type)
+        columns: Columns = {}
+        for name in training_class.get_fields():
+            column = source.get(name)
+            if column is None:
+                raise ValueError(f'{workout_type} packages need the {name} '
+                                 f'column')
+            columns[name] = [column[index] for index in indexes]
+        results = training_class.calculate_columns(columns)
+        for target, values in zip((distance, speed, calories), results):
+            for index, value in zip(indexes, values):
+                target[index] = value
+    return distance, speed, calories
+
+
+class TrainingBatch:
+    """Columnar storage of packages backed by typed arrays.
+
+    A row costs 8 bytes per numeric field plus one byte for the workout
+    type, instead of a whole Training object with its __dict__.
+    Indexing the batch builds a Training object for a single row.
+    """
+    FIELDS: ClassVar[Tuple[str, ...]] = ('action', 'duration', 'weight',
+                                         'height', 'length_pool',
+                                         'count_pool')
+    __slots__ = ('workout_types', 'columns', '_codes', '_classes')
+
+    def __init__(self, packages: Iterable[Package] = ()) -> None:
+        self.workout_types = array('B')
+        self.columns: Dict[str, array] = {
+            name: array('d') for name in self.FIELDS
+        }
+        self._codes: Dict[str, int] = {}
+        self._classes: List[Tuple[str, Type[Training]]] = []
+        self.extend(packages)
+
+    def __len__(self) -> int:
+        return len(self.workout_types)
+
+    def __getitem__(self, index: int) -> Training:
+        _, training_class = self._classes[self.workout_types[index]]
+        return training_class(*[self.columns[name][index]
+                                for name in training_class.get_fields()])
+
+    def append(self, workout_type: str, data: Sequence[float]) -> None:
+        """Adds a package to the end of the batch."""
+        if workout_type not in self._codes:
+            training_class = get_training_class(workout_type)
+            self._codes[workout_type] = len(self._classes)
+            self._classes.append((workout_type, training_class))
+        code = self._codes[workout_type]
+        training_class = self._classes[code][1]
+        if len(data) != training_class.ARITY:
+            raise package_error(workout_type, data)
+        row = dict(zip(training_class.get_fields(), data))
+        self.workout_types.append(code)
+        for name, column in self.columns.items():
+            column.append(row.get(name, 0))
+
+    def extend(self, packages: Iterable[Package]) -> None:
+        """Adds packages to the end of the batch."""
+        for workout_type, data in packages:
+            self.append(workout_type, data)
+
+    def calculate(self) -> MetricColumns:
+        """Calculates distance, speed and calories for every row."""
+        workout_types = [self._classes[code][0]
+                         for code in self.workout_types]
+        return calculate_batch(workout_types, **self.columns)
+
+
+def parse_number(value: str) -> Union[int, float]:
+    """Converts a sensor value to int, falling back to float."""
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def read_packages(lines: Iterable[str]) -> Iterator[Package]:
+    """Lazily reads packages from CSV or JSON lines.
+
+    CSV lines look like ``SWM,720,1,80,25,40``, JSON lines are either
+    ``["SWM", [720, 1, 80, 25, 40]]`` or
+    ``{"workout_type": "SWM", "data": [720, 1, 80, 25, 40]}``.
+    Blank lines are skipped.
+    """
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line[0] in '[{':
+            import json
+
+            package = json.loads(line)
+            if isinstance(package, dict):
+                yield package['workout_type'], package['data']
+            else:
+                workout_type, data = package
+                yield workout_type, data
+        else:
+            workout_type, *values = line.split(',')
+            yield workout_type.strip(), [parse_number(value)
+                                         for value in values]
+
+
+class PackageCache:
+    """Bounded LRU cache of info messages keyed by package.
+
+    Packages are deterministic, so a package uploaded again (a device
+    retrying) is answered from the cache instead of being recomputed.
+    Cached messages are shared between callers and must not be changed.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        if maxsize < 1:
+            raise ValueError('PackageCache maxsize must be positive')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[Tuple, List]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _entry(self, workout_type: str, data: Sequence[float]) -> List:
+        key = (workout_type, tuple(data))
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+        self.misses += 1
+        entry = [read_package(workout_type, data).show_training_info(), None]
+        self._entries[key] = entry
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def get(self, workout_type: str, data: Sequence[float]) -> InfoMessage:
+        """Get back the info message of the package."""
+        return self._entry(workout_type, data)[0]
+
+    def get_message(self, workout_type: str, data: Sequence[float]) -> str:
+        """Get back the rendered message of the package."""
+        entry = self._entry(workout_type, data)
+        if entry[1] is None:
+            entry[1] = entry[0].get_message()
+        return entry[1]
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'size': len(self._entries),
+                'maxsize': self.maxsize}
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+
+def process_packages(packages: Iterable[Package],
+                     buffer_size: int = 1024,
+                     cache: Optional[PackageCache] = None,
+                     rejects: Optional[List[Tuple[Package, str]]] = None
+                     ) -> Iterator[InfoMessage]:
+    """Converts packages into info messages, holding at most
+    buffer_size packages in memory at a time. Repeated packages are
+    taken from cache when one is given. With rejects, broken packages
+    are moved there by validate_packages() instead of raising."""
+    if rejects is not None:
+        packages = validate_packages(packages, rejects)
+    packages = iter(packages)
+    while True:
+        buffer = list(islice(packages, buffer_size))
+        if not buffer:
+            return
+        if cache is not None:
+            for workout_type, data in buffer:
+                yield cache.get(workout_type, data)
+            continue
+        for workout_type, data in buffer:
+            yield read_package(workout_type, data).show_training_info()
+
+
+def process_chunk(chunk: List[Package]) -> List[tuple]:
+    """Converts a chunk of packages into the fields of their info
+    messages, a column per field.
+
+    Columns of strings and floats cost a fraction of the messages
+    themselves to pickle and unpickle, and the process collecting the
+    results of every worker does the unpickling alone.
+    """
+    values = attrgetter(*InfoMessage.__slots__)
+    return list(zip(*[
+        values(read_package(workout_type, data).show_training_info())
+        for workout_type, data in chunk
+    ]))
+
+
+def process_packages_parallel(packages: Iterable[Package],
+                              workers: Optional[int] = None,
+                              chunk_size: int = 1024,
+                              ordered: bool = True
+                              ) -> Iterator[InfoMessage]:
+    """Converts packages into info messages on a pool of processes.
+
+    Packages are sent to the workers in chunks, and at most two chunks
+    per worker are in flight, so the input is never read ahead
+    unboundedly. With ordered=False chunks are yielded as soon as they
+    are ready, which keeps every worker busy.
+    """
+    from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor,
+                                    wait)
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = 2 * workers
+    packages = iter(packages)
+    with ProcessPoolExecutor(workers) as executor:
+        pending: deque = deque()
+        while True:
+            while len(pending) < max_pending:
+                chunk = list(islice(packages, chunk_size))
+                if not chunk:
+                    break
+                pending.append(executor.submit(process_chunk, chunk))
+            if not pending:
+                return
+            if ordered:
+                done = pending.popleft()
+            else:
+                done = next(iter(wait(pending,
+                                      return_when=FIRST_COMPLETED).done))
+                pending.remove(done)
+            yield from map(InfoMessage, *done.result())
 
 
 def main(training: Training) -> None:
@@ -163,13 +698,70 @@ def main(training: Training) -> None:
     print(info.get_message())
 
 
+SAMPLE_PACKAGES: List[Package] = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+]
+USAGE = ('usage: homework.py [WORKOUT_TYPE VALUE... | FILE | - | --batch]\n'
+         '  WORKOUT_TYPE VALUE...  process a single package\n'
+         '  FILE, -                process CSV or JSON lines packages\n'
+         '                         from a file or stdin\n'
+         '  --batch                answer every stdin line at once,\n'
+         '                         so one process serves many requests\n'
+         'Without arguments the sample packages are processed.\n')
+PACKAGE_ERRORS = (KeyError, OverflowError, TypeError, ValueError,
+                  ZeroDivisionError)
+
+
+def serve_batch(stdin: TextIO, stdout: TextIO) -> None:
+    """Answers each package line of stdin with a message line as soon
+    as it is read. Broken packages are answered with an error line."""
+    cache = PackageCache()
+    for line in iter(stdin.readline, ''):
+        answers = []
+        try:
+            for workout_type, data in read_packages([line]):
+                reason = check_package(workout_type, data)
+                if reason is None:
+                    answers.append(cache.get_message(workout_type, data))
+                else:
+                    answers.append(f'error: {reason}')
+        except Exception as error:
+            answers = [f'error: {error}']
+        stdout.write(''.join(f'{answer}\n' for answer in answers))
+        stdout.flush()
+
+
+def run_cli(argv: Sequence[str],
+            stdin: Optional[TextIO] = None,
+            stdout: Optional[TextIO] = None
+            ) -> int:
+    """Command line entry point, get back the exit status."""
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    if argv and argv[0] in ('-h', '--help'):
+        stdout.write(USAGE)
+        return 0
+    try:
+        if not argv:
+            write_messages(process_packages(SAMPLE_PACKAGES), stdout)
+        elif argv[0] == '--batch':
+            serve_batch(stdin, stdout)
+        elif argv[0] in TRAINING_TYPES:
+            package = (argv[0], [parse_number(value) for value in argv[1:]])
+            write_messages(process_packages([package]), stdout)
+        elif argv[0] == '-':
+            write_messages(process_packages(read_packages(stdin)), stdout)
+        else:
+            with open(argv[0], encoding='utf-8') as source:
+                write_messages(process_packages(read_packages(source)),
+                               stdout)
+    except (OSError, *PACKAGE_ERRORS) as error:
+        sys.stderr.write(f'homework.py: {error}\n')
+        return 1
+    return 0
+
+
 if __name__ == '__main__':
-    packages: List[Tuple[str, List[int]]] = [
-        ('SWM', [720, 1, 80, 25, 40]),
-        ('RUN', [15000, 1, 75]),
-        ('WLK', [9000, 1, 75, 180]),
-    ]
-
-    for workout_type, data in packages:
-        training = read_package(workout_type, data)
-        main(training)
+    sys.exit(run_cli(sys.argv[1:]))
@@ -0,0 +1,191 @@
+"""Opt-in counters and latency histograms for the stages of homework.py.
+
+While enabled, read_package(), Training.show_training_info(),
+InfoMessage.get_message() and write_messages() are replaced by timing
+wrappers, in homework and in every module imported so far that took
+the function with "from homework import ..."; disabling puts the
+original functions back, so there is no cost at all when the
+instrumentation is off.
+
+The wrappers are installed once for all the enabled Instrumentation
+objects, each of them recording every call, and removed when the last
+one is disabled.
+
+Usage:
+    instrumentation = Instrumentation()
+    with instrumentation.enabled():
+        ...
+    print(instrumentation.prometheus())
+"""
+from bisect import bisect_left
+import sys
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+from types import ModuleType
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import homework
+
+STAGES: Dict[str, Tuple[object, str]] = {
+    'read_package': (homework, 'read_package'),
+    'show_training_info': (homework.Training, 'show_training_info'),
+    'get_message': (homework.InfoMessage, 'get_message'),
+    'write_messages': (homework, 'write_messages'),
+}
+BUCKETS: Tuple[float, ...] = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5,
+                              1e-4, 2.5e-4, 5e-4, 1e-3, 1e-2, 1e-1)
+
+
+class Histogram:
+    """Latency histogram with fixed bucket bounds in seconds."""
+
+    def __init__(self, bounds: Tuple[float, ...] = BUCKETS) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def snapshot(self) -> Dict[str, object]:
+        """Get back the count, sum and cumulative bucket counts."""
+        cumulative: List[Tuple[str, int]] = []
+        running = 0
+        for bound, count in zip(self.bounds + (float('inf'),), self.counts):
+            running += count
+            cumulative.append((repr(bound) if bound != float('inf')
+                               else '+Inf', running))
+        return {'count': self.count, 'sum': self.total,
+                'buckets': dict(cumulative)}
+
+
+# Instrumentation objects enabled, replaced as a whole so that wrappers
+# running in other threads iterate over a consistent tuple.
+ENABLED: Tuple['Instrumentation', ...] = ()
+# Original function of every stage with the objects it was replaced in.
+INSTALLED: Dict[str, Tuple[Callable, List[object]]] = {}
+LOCK = threading.Lock()
+
+
+def wrap(stage: str, function: Callable) -> Callable:
+    """Get back function timed into the stage histogram of every enabled
+    Instrumentation."""
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        except Exception:
+            for instrumentation in ENABLED:
+                instrumentation.errors[stage] += 1
+            raise
+        finally:
+            elapsed = perf_counter() - start
+            for instrumentation in ENABLED:
+                instrumentation.histograms[stage].observe(elapsed)
+    return wrapper
+
+
+def owners(owner: object, name: str, original: Callable) -> List[object]:
+    """Get back the objects holding the original function of a stage:
+    the owner, and for a function of a module every module that
+    imported it by name."""
+    if not isinstance(owner, ModuleType):
+        return [owner]
+    return [owner] + [
+        module for module in list(sys.modules.values())
+        if module is not owner and isinstance(module, ModuleType)
+        and vars(module).get(name) is original
+    ]
+
+
+def install() -> None:
+    for stage, (owner, name) in STAGES.items():
+        original = getattr(owner, name)
+        holders = owners(owner, name, original)
+        wrapper = wrap(stage, original)
+        for holder in holders:
+            setattr(holder, name, wrapper)
+        INSTALLED[stage] = (original, holders)
+
+
+def uninstall() -> None:
+    for stage, (original, holders) in INSTALLED.items():
+        name = STAGES[stage][1]
+        for holder in holders:
+            setattr(holder, name, original)
+    INSTALLED.clear()
+
+
+class Instrumentation:
+    """Per-stage call counters and latency histograms."""
+
+    def __init__(self) -> None:
+        self.histograms: Dict[str, Histogram] = {
+            stage: Histogram() for stage in STAGES
+        }
+        self.errors: Dict[str, int] = dict.fromkeys(STAGES, 0)
+
+    @property
+    def is_enabled(self) -> bool:
+        return self in ENABLED
+
+    def enable(self) -> None:
+        global ENABLED
+        with LOCK:
+            if self.is_enabled:
+                return
+            if not ENABLED:
+                install()
+            ENABLED += (self,)
+
+    def disable(self) -> None:
+        global ENABLED
+        with LOCK:
+            if not self.is_enabled:
+                return
+            ENABLED = tuple(instrumentation for instrumentation in ENABLED
+                            if instrumentation is not self)
+            if not ENABLED:
+                uninstall()
+
+    @contextmanager
+    def enabled(self) -> Iterator['Instrumentation']:
+        self.enable()
+        try:
+            yield self
+        finally:
+            self.disable()
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        """Get back the collected metrics as a plain dict per stage."""
+        result = {}
+        for stage, histogram in self.histograms.items():
+            result[stage] = histogram.snapshot()
+            result[stage]['errors'] = self.errors[stage]
+        return result
+
+    def prometheus(self, prefix: str = 'homework') -> str:
+        """Get back the collected metrics in Prometheus text format."""
+        name = f'{prefix}_stage_seconds'
+        lines = [f'# HELP {name} Time spent in a processing stage.',
+                 f'# TYPE {name} histogram']
+        for stage, values in self.snapshot().items():
+            for bound, count in values['buckets'].items():
+                lines.append(f'{name}_bucket{{stage="{stage}",'
+                             f'le="{bound}"}} {count}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {values["sum"]}')
+            lines.append(f'{name}_count{{stage="{stage}"}} '
+                         f'{values["count"]}')
+        errors = f'{prefix}_stage_errors_total'
+        lines.append(f'# HELP {errors} Exceptions raised by a stage.')
+        lines.append(f'# TYPE {errors} counter')
+        for stage, count in self.errors.items():
+            lines.append(f'{errors}{{stage="{stage}"}} {count}')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,239 @@
+"""Resumable batch recomputation of package archives.
+
+A BatchJob reads an archive of package lines in chunks of chunk_size
+lines, appends the messages of every chunk to the output file and adds
+them to totals per workout type. Every checkpoint_every chunks it
+writes a checkpoint file (replacing the previous one atomically) with:
+
+* the input path and the byte offset reached in it;
+* the size of the output file at that moment;
+* the totals and the number of rejected packages, counting the lines
+  that can't be read as packages and the packages that fail to
+  calculate;
+* the size of the chunk log at that moment. The log is a file next
+  to the checkpoint, with the .chunks suffix, that the start offsets
+  and content hashes of processed chunks are appended to, one a line.
+
+Run again after a failure, the job truncates the output and the chunk
+log to the sizes recorded in the checkpoint, so messages written after
+it are not repeated, and goes on from the recorded offset. Run again
+over an archive it has finished, it goes on from the end of the last
+chunk if that chunk is still in place, so only lines appended since
+are processed. Otherwise (another archive, or one that was rewritten)
+it starts from the beginning but skips the chunks it has seen at the
+same offset with the same hash. Without a checkpoint the output file
+and the chunk log are written anew.
+
+Usage: python jobs.py INPUT OUTPUT CHECKPOINT
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+from itertools import islice
+from typing import (TYPE_CHECKING, Any, BinaryIO, Dict, Iterable, Iterator,
+                    List, Optional, Set, Tuple)
+
+from aggregation import METRICS, WorkoutTotals
+from homework import (InfoMessage, check_package, read_package,
+                      read_packages, write_messages)
+
+if TYPE_CHECKING:
+    from homework import Package
+
+
+def totals_state(totals: WorkoutTotals) -> Dict[str, List[float]]:
+    """Get back the totals as a JSON-friendly dictionary."""
+    return {name: [summary.count, summary.total, summary.minimum,
+                   summary.maximum]
+            for name, summary in totals.metrics.items()}
+
+
+def totals_from_state(state: Dict[str, List[float]]) -> WorkoutTotals:
+    totals = WorkoutTotals()
+    for name in METRICS:
+        summary = totals.metrics[name]
+        (summary.count, summary.total,
+         summary.minimum, summary.maximum) = state[name]
+    return totals
+
+
+class BatchJob:
+    """Checkpointed processing of an archive into an output file."""
+
+    def __init__(self,
+                 source: str,
+                 output: str,
+                 checkpoint: str,
+                 chunk_size: int = 10000,
+                 checkpoint_every: int = 10
+                 ) -> None:
+        self.source = source
+        self.output = output
+        self.checkpoint = checkpoint
+        self.chunk_size = chunk_size
+        self.checkpoint_every = checkpoint_every
+        self.totals: Dict[str, WorkoutTotals] = {}
+        self.rejected = 0
+        self.chunks: Set[str] = set()
+        self.new_chunks: List[str] = []
+        self.skipped = 0
+
+    @property
+    def chunk_log(self) -> str:
+        return f'{self.checkpoint}.chunks'
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Reads the checkpoint, if there is one, and the chunk log up to
+        the size recorded in it."""
+        state = None
+        if os.path.exists(self.checkpoint):
+            with open(self.checkpoint, encoding='utf-8') as file:
+                state = json.load(file)
+        with open(self.chunk_log, 'a+', encoding='utf-8') as log:
+            log.truncate(state['chunk_log_size'] if state else 0)
+            log.seek(0)
+            self.chunks = set(log.read().split())
+        self.new_chunks = []
+        if state is None:
+            return None
+        self.totals = {training_type: totals_from_state(totals)
+                       for training_type, totals in state['totals'].items()}
+        self.rejected = state['rejected']
+        return state
+
+    def save(self,
+             offset: int,
+             output_size: int,
+             complete: bool,
+             tail: Optional[Tuple[int, str]] = None
+             ) -> None:
+        """Appends the new chunks to the chunk log, then writes the
+        checkpoint to a temporary file and moves it over the previous
+        one, so that a failure keeps one of them whole."""
+        with open(self.chunk_log, 'a', encoding='utf-8') as log:
+            log.writelines(f'{chunk}\n' for chunk in self.new_chunks)
+            log.flush()
+            os.fsync(log.fileno())
+            chunk_log_size = log.tell()
+        self.new_chunks = []
+        state = {
+            'input': os.path.abspath(self.source),
+            'offset': offset,
+            'output_size': output_size,
+            'complete': complete,
+            'tail': tail,
+            'totals': {training_type: totals_state(totals)
+                       for training_type, totals in self.totals.items()},
+            'rejected': self.rejected,
+            'chunk_log_size': chunk_log_size,
+        }
+        temporary = f'{self.checkpoint}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump(state, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.checkpoint)
+
+    def process_chunk(self, lines: List[bytes], out) -> None:
+        """Calculates a chunk, writes its messages and adds them to the
+        totals."""
+        messages = self.calculate(self.read_lines(lines))
+        write_messages(messages, out)
+        for info in messages:
+            totals = self.totals.get(info.training_type)
+            if totals is None:
+                totals = self.totals[info.training_type] = WorkoutTotals()
+            totals.add(info)
+
+    def calculate(self, packages: Iterable[Package]) -> List[InfoMessage]:
+        """Get back the messages of the packages, counting the ones that
+        check_package() refuses or that fail to calculate as rejected."""
+        messages = []
+        for workout_type, data in packages:
+            try:
+                if check_package(workout_type, data) is None:
+                    messages.append(
+                        read_package(workout_type, data).show_training_info()
+                    )
+                    continue
+            except Exception:
+                pass
+            self.rejected += 1
+        return messages
+
+    def read_lines(self, lines: Iterable[bytes]) -> Iterator[Package]:
+        """Yields the packages of the lines one at a time, counting the
+        lines that can't be read as rejected."""
+        for line in lines:
+            try:
+                yield from read_packages([line.decode('utf-8')])
+            except Exception:
+                self.rejected += 1
+
+    def start_offset(self,
+                     state: Optional[Dict[str, Any]],
+                     source: BinaryIO
+                     ) -> int:
+        """Get back the offset to go on from."""
+        if state is None or state['input'] != os.path.abspath(self.source):
+            return 0
+        if not state['complete'] or state['tail'] is None:
+            return state['offset']
+        start, digest = state['tail']
+        source.seek(start)
+        data = source.read(state['offset'] - start)
+        if hashlib.blake2b(data, digest_size=16).hexdigest() != digest:
+            return 0
+        return state['offset']
+
+    def run(self) -> Dict[str, WorkoutTotals]:
+        """Processes the archive from the checkpoint on, get back the
+        totals per workout type."""
+        state = self.load()
+        self.skipped = 0
+        tail = None
+        with open(self.source, 'rb') as source, \
+                open(self.output, 'a+', encoding='utf-8') as out:
+            out.truncate(state['output_size'] if state else 0)
+            offset = self.start_offset(state, source)
+            source.seek(offset)
+            pending = 0
+            while True:
+                lines = list(islice(source, self.chunk_size))
+                if not lines:
+                    break
+                digest = hashlib.blake2b(b''.join(lines),
+                                         digest_size=16).hexdigest()
+                chunk = f'{offset}:{digest}'
+                tail = (offset, digest)
+                offset += sum(map(len, lines))
+                if chunk in self.chunks:
+                    self.skipped += 1
+                else:
+                    self.process_chunk(lines, out)
+                    self.chunks.add(chunk)
+                    self.new_chunks.append(chunk)
+                pending += 1
+                if pending == self.checkpoint_every:
+                    out.flush()
+                    os.fsync(out.fileno())
+                    self.save(offset, out.tell(), False, tail)
+                    pending = 0
+            out.flush()
+            os.fsync(out.fileno())
+            if tail is None and state is not None:
+                tail = state['tail']
+            self.save(offset, out.tell(), True, tail)
+        return self.totals
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 4:
+        sys.exit(__doc__.splitlines()[-1])
+    job = BatchJob(*sys.argv[1:])
+    for training_type, totals in job.run().items():
+        print(training_type, json.dumps(totals.as_dict()))
+    print(f'rejected {job.rejected}, skipped chunks {job.skipped}')
@@ -0,0 +1,167 @@
+"""Top workouts by metric, kept up to date as workouts are added.
+
+For every metric and workout type (and for all types together) the
+Leaderboard keeps a list of values sorted with bisect, answering range
+queries, and a min-heap of the k largest values, answering top queries
+without looking at the rest. Workouts older than ttl seconds than the
+newest one are dropped in timestamp order.
+
+Usage:
+    leaderboard = Leaderboard(k=10, ttl=24 * 60 * 60)
+    leaderboard.add(training.show_training_info(), key='athlete-1')
+    leaderboard.top('calories')
+    leaderboard.between('speed', 5, 10, training_type='Running')
+"""
+import time
+from bisect import bisect_left, bisect_right, insort
+from heapq import heappop, heappush, heapreplace
+from itertools import count
+from typing import Dict, Hashable, List, NamedTuple, Optional, Tuple, Union
+
+from homework import InfoMessage, Training
+
+METRICS = ('distance', 'speed', 'calories')
+Item = Tuple[float, int]
+
+
+class Entry(NamedTuple):
+    """A workout of the leaderboard."""
+
+    timestamp: float
+    key: Hashable
+    info: InfoMessage
+
+
+class MetricIndex:
+    """Values of a metric as (value, number) items, sorted and with the
+    largest k of them in a heap."""
+    __slots__ = ('k', 'ordered', 'top')
+
+    def __init__(self, k: int) -> None:
+        self.k = k
+        self.ordered: List[Item] = []
+        self.top: List[Item] = []
+
+    def __len__(self) -> int:
+        return len(self.ordered)
+
+    def add(self, item: Item) -> None:
+        insort(self.ordered, item)
+        if len(self.top) < self.k:
+            heappush(self.top, item)
+        elif item > self.top[0]:
+            heapreplace(self.top, item)
+
+    def remove(self, item: Item) -> None:
+        del self.ordered[bisect_left(self.ordered, item)]
+        if len(self.top) < self.k or item >= self.top[0]:
+            # An ascending list is a heap already.
+            self.top = self.ordered[-self.k:]
+
+    def largest(self, k: int) -> List[Item]:
+        if k > self.k:
+            return self.ordered[:-k - 1:-1]
+        return sorted(self.top, reverse=True)[:k]
+
+    def between(self, low: float, high: float) -> List[Item]:
+        return self.ordered[bisect_left(self.ordered, (low, -1)):
+                            bisect_right(self.ordered, (high, float('inf')))]
+
+
+class Leaderboard:
+    """Indexed store of recent workouts."""
+
+    def __init__(self,
+                 k: int = 10,
+                 ttl: float = 24 * 60 * 60,
+                 metrics: Tuple[str, ...] = METRICS
+                 ) -> None:
+        self.k = k
+        self.ttl = ttl
+        self.metrics = metrics
+        self.entries: Dict[int, Entry] = {}
+        self.indexes: Dict[Tuple[str, Optional[str]], MetricIndex] = {}
+        self._expiry: List[Tuple[float, int]] = []
+        self.latest = float('-inf')
+        self._numbers = count()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def index(self,
+              metric: str,
+              training_type: Optional[str] = None
+              ) -> MetricIndex:
+        """Get back the index of a metric for a workout type, or for all
+        types if it is None."""
+        if metric not in self.metrics:
+            raise ValueError(f'Unknown metric {metric}. '
+                             f'Try to use one of:{self.metrics}')
+        index = self.indexes.get((metric, training_type))
+        if index is None:
+            index = self.indexes[metric, training_type] = MetricIndex(self.k)
+        return index
+
+    def add(self,
+            workout: Union[InfoMessage, Training],
+            timestamp: Optional[float] = None,
+            key: Hashable = None
+            ) -> None:
+        """Adds a workout, given as a Training or its InfoMessage, done
+        at timestamp (now by default) by key, an athlete for instance."""
+        if isinstance(workout, Training):
+            workout = workout.show_training_info()
+        if timestamp is None:
+            timestamp = time.time()
+        if timestamp <= self.latest - self.ttl:
+            return
+        number = next(self._numbers)
+        self.entries[number] = Entry(timestamp, key, workout)
+        heappush(self._expiry, (timestamp, number))
+        for metric in self.metrics:
+            item = (getattr(workout, metric), number)
+            self.index(metric).add(item)
+            self.index(metric, workout.training_type).add(item)
+        self.expire(timestamp)
+
+    def expire(self, now: float) -> None:
+        """Drops workouts done ttl seconds or more before now or before
+        the newest timestamp seen, whichever is later."""
+        if now > self.latest:
+            self.latest = now
+        oldest = self.latest - self.ttl
+        expiry = self._expiry
+        while expiry and expiry[0][0] <= oldest:
+            _, number = heappop(expiry)
+            info = self.entries.pop(number).info
+            for metric in self.metrics:
+                item = (getattr(info, metric), number)
+                self.index(metric).remove(item)
+                self.index(metric, info.training_type).remove(item)
+
+    def top(self,
+            metric: str,
+            training_type: Optional[str] = None,
+            k: Optional[int] = None,
+            now: Optional[float] = None
+            ) -> List[Entry]:
+        """Get back the workouts with the largest values of metric,
+        largest first."""
+        if now is not None:
+            self.expire(now)
+        items = self.index(metric, training_type).largest(k or self.k)
+        return [self.entries[number] for _, number in items]
+
+    def between(self,
+                metric: str,
+                low: float,
+                high: float,
+                training_type: Optional[str] = None,
+                now: Optional[float] = None
+                ) -> List[Entry]:
+        """Get back the workouts with low <= metric <= high, smallest
+        first."""
+        if now is not None:
+            self.expire(now)
+        items = self.index(metric, training_type).between(low, high)
+        return [self.entries[number] for _, number in items]
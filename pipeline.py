@@ -0,0 +1,185 @@
+"""Threaded pipeline for packages coming from slow sources.
+
+Three stages connected by bounded queues:
+
+* readers - threads taking sources (file paths or iterables of lines,
+  such as files on network mounts or socket files) one after another
+  and putting chunks of valid packages into the packages queue;
+* workers - threads calculating chunks with read_package() and putting
+  the messages into the messages queue;
+* writers - threads collecting messages into batches and writing each
+  batch with write_messages() in one call.
+
+A reader waiting for its source lets the other threads run, so reading
+overlaps with computing and writing. Calculation itself holds the GIL,
+so more than one worker only helps when sources are slow. Messages of
+different sources are written in no particular order.
+
+Usage:
+    pipeline = Pipeline(readers=8)
+    pipeline.run(['a.csv', 'b.csv'], sys.stdout)
+    pipeline.stats()
+"""
+from __future__ import annotations
+
+import queue
+import threading
+from itertools import islice
+from typing import TYPE_CHECKING, Dict, Iterable, List, TextIO, Tuple, Union
+
+from homework import (InfoMessage, read_package, read_packages,
+                      validate_packages, write_messages)
+
+if TYPE_CHECKING:
+    from homework import Package
+
+Source = Union[str, Iterable[str]]
+DONE = None
+
+
+class MeteredQueue(queue.Queue):
+    """Bounded queue recording its depth after every put."""
+
+    def __init__(self, maxsize: int) -> None:
+        super().__init__(maxsize)
+        self.puts = 0
+        self.depth_total = 0
+        self.max_depth = 0
+
+    def _put(self, item) -> None:
+        super()._put(item)
+        depth = len(self.queue)
+        self.puts += 1
+        self.depth_total += depth
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'puts': self.puts,
+            'max_depth': self.max_depth,
+            'mean_depth': self.depth_total / self.puts if self.puts else 0.0,
+            'maxsize': self.maxsize,
+        }
+
+
+class Pipeline:
+    """Reader, worker and writer threads with a bounded queue between
+    every two stages."""
+
+    def __init__(self,
+                 readers: int = 4,
+                 workers: int = 1,
+                 writers: int = 1,
+                 queue_size: int = 64,
+                 chunk_size: int = 256,
+                 batch_size: int = 4096
+                 ) -> None:
+        self.readers = readers
+        self.workers = workers
+        self.writers = writers
+        self.queue_size = queue_size
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.rejects: List[Tuple[Package, str]] = []
+        self.errors: List[BaseException] = []
+        self.written = 0
+        self.packages = MeteredQueue(queue_size)
+        self.messages = MeteredQueue(queue_size)
+        self._lock = threading.Lock()
+
+    def read(self, sources: 'queue.SimpleQueue[Source]') -> None:
+        while True:
+            try:
+                source = sources.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                if isinstance(source, str):
+                    with open(source, encoding='utf-8') as lines:
+                        self.read_source(lines)
+                else:
+                    self.read_source(source)
+            except Exception as error:
+                self.errors.append(error)
+
+    def read_source(self, lines: Iterable[str]) -> None:
+        packages = validate_packages(read_packages(lines), self.rejects)
+        while True:
+            chunk = list(islice(packages, self.chunk_size))
+            if not chunk:
+                return
+            self.packages.put(chunk)
+
+    def calculate(self) -> None:
+        failed = False
+        while True:
+            chunk = self.packages.get()
+            if chunk is DONE:
+                return
+            if failed:
+                continue
+            try:
+                self.messages.put([
+                    read_package(workout_type, data).show_training_info()
+                    for workout_type, data in chunk
+                ])
+            except Exception as error:
+                self.errors.append(error)
+                failed = True
+
+    def write(self, out: TextIO) -> None:
+        batch: List[InfoMessage] = []
+        failed = False
+        while True:
+            chunk = self.messages.get()
+            if chunk is not DONE:
+                batch.extend(chunk)
+                if len(batch) < self.batch_size:
+                    continue
+            if not failed:
+                try:
+                    with self._lock:
+                        write_messages(batch, out)
+                        self.written += len(batch)
+                except Exception as error:
+                    self.errors.append(error)
+                    failed = True
+            batch = []
+            if chunk is DONE:
+                return
+
+    def run(self, sources: Iterable[Source], out: TextIO) -> int:
+        """Writes the messages of all sources to out, get back their
+        number. Invalid packages are appended to rejects; the first
+        error of a thread is raised once the pipeline has stopped."""
+        pending: 'queue.SimpleQueue[Source]' = queue.SimpleQueue()
+        for source in sources:
+            pending.put(source)
+        stages = [
+            (self.readers, self.read, (pending,), self.packages,
+             self.workers),
+            (self.workers, self.calculate, (), self.messages, self.writers),
+            (self.writers, self.write, (out,), None, 0),
+        ]
+        running = []
+        for count, target, args, _, _ in stages:
+            threads = [threading.Thread(target=target, args=args,
+                                        daemon=True)
+                       for _ in range(count)]
+            for thread in threads:
+                thread.start()
+            running.append(threads)
+        for threads, (_, _, _, output, consumers) in zip(running, stages):
+            for thread in threads:
+                thread.join()
+            for _ in range(consumers):
+                output.put(DONE)
+        if self.errors:
+            raise self.errors[0]
+        return self.written
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Get back the depth statistics of the queues."""
+        return {'packages': self.packages.stats(),
+                'messages': self.messages.stats()}
@@ -0,0 +1,144 @@
+"""Asyncio server that turns uploaded sensor packages into messages.
+
+Every request is a line holding a JSON package, either
+``["RUN", [15000, 1, 75]]`` or
+``{"workout_type": "RUN", "data": [15000, 1, 75]}``.
+The server answers each request with a line in the same order: the
+text of InfoMessage.get_message() or, in JSON mode, an object with the
+message fields. Packages that can't be read get ``{"error": "..."}``.
+
+Usage: python server.py [--port PORT | --unix PATH] [--json]
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+from typing import List, Optional
+
+import homework
+
+
+class PackageServer:
+    """Reads requests of a connection into a bounded queue and answers
+    them in micro-batches.
+
+    When the queue is full the connection is not read any further, so a
+    client sending faster than the server computes is slowed down by
+    TCP flow control instead of filling memory.
+    """
+
+    def __init__(self,
+                 output: str = 'text',
+                 batch_size: int = 256,
+                 queue_size: int = 1024
+                 ) -> None:
+        self.output = output
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+
+    def answer(self, line: bytes) -> str:
+        """Get back the response line for a request line."""
+        try:
+            (workout_type, data), = homework.read_packages([line.decode()])
+            training = homework.read_package(workout_type, data)
+            info = training.show_training_info()
+        except Exception as error:
+            return json.dumps({'error': str(error)}, ensure_ascii=False)
+        if self.output == 'json':
+            return json.dumps({
+                'training_type': info.training_type,
+                'duration': info.duration,
+                'distance': info.distance,
+                'speed': info.speed,
+                'calories': info.calories,
+            }, ensure_ascii=False)
+        return info.get_message()
+
+    async def handle(self,
+                     reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter
+                     ) -> None:
+        """Serves a single connection."""
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        answering = asyncio.ensure_future(self.answer_queue(queue, writer))
+        try:
+            async for line in reader:
+                if line.strip() and not await self.put(queue, line,
+                                                       answering):
+                    break
+        finally:
+            await self.put(queue, None, answering)
+            try:
+                with contextlib.suppress(ConnectionError):
+                    await answering
+            finally:
+                writer.close()
+
+    @staticmethod
+    async def put(queue: asyncio.Queue,
+                  item: Optional[bytes],
+                  answering: asyncio.Future
+                  ) -> bool:
+        """Puts item into the queue, waiting for room unless the task
+        answering the queue has stopped. Get back False in that case."""
+        if answering.done():
+            return False
+        if not queue.full():
+            queue.put_nowait(item)
+            return True
+        putting = asyncio.ensure_future(queue.put(item))
+        await asyncio.wait({putting, answering},
+                           return_when=asyncio.FIRST_COMPLETED)
+        if putting.done():
+            return True
+        putting.cancel()
+        return False
+
+    async def answer_queue(self,
+                           queue: asyncio.Queue,
+                           writer: asyncio.StreamWriter
+                           ) -> None:
+        """Answers queued requests, taking whatever is already waiting
+        (up to batch_size) with a single write."""
+        while True:
+            batch: List[Optional[bytes]] = [await queue.get()]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            finished = batch[-1] is None
+            lines = [self.answer(line) for line in batch if line is not None]
+            if lines:
+                lines.append('')
+                writer.write('\n'.join(lines).encode())
+                await writer.drain()
+            if finished:
+                return
+
+    async def start(self,
+                    host: str = '127.0.0.1',
+                    port: int = 8765,
+                    path: Optional[str] = None
+                    ) -> asyncio.AbstractServer:
+        """Starts listening on a TCP port or, if path is given, on a
+        Unix socket."""
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle, path)
+        return await asyncio.start_server(self.handle, host, port)
+
+
+async def serve(host: str, port: int, path: Optional[str], output: str
+                ) -> None:
+    server = await PackageServer(output).start(host, port, path)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', metavar='PATH')
+    parser.add_argument('--json', action='store_true',
+                        help='answer with JSON objects instead of text')
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port, args.unix,
+                      'json' if args.json else 'text'))
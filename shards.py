@@ -0,0 +1,254 @@
+"""Processing of package streams split by athlete between workers.
+
+A worker is a separate process listening on a socket, standing in for
+a node. The coordinator connects to every worker, puts each record into
+the shard of its athlete and sends the shard to its worker in chunks.
+Workers read and calculate packages, send back the rendered messages of
+every chunk and, at the end of a run, their partial Aggregator, which
+the coordinator merges. All records of an athlete go to the same
+worker, so their order is kept.
+
+A record is a tuple (athlete, day, workout_type, data).
+
+Workers on other hosts are started with the same SHARDS_AUTHKEY
+environment variable (hex) as the coordinator:
+    python shards.py worker HOST PORT
+
+Usage:
+    with Coordinator(workers=4) as coordinator:
+        result = coordinator.run(records)
+"""
+import os
+import subprocess
+import sys
+import zlib
+from collections import deque
+from datetime import date
+from multiprocessing.connection import Client, Connection, Listener, wait
+from typing import (Deque, Dict, Iterable, List, NamedTuple, Optional,
+                    Sequence, Tuple, Union)
+
+from aggregation import Aggregator
+from homework import check_package, read_package
+
+AUTHKEY_VARIABLE = 'SHARDS_AUTHKEY'
+USAGE = 'usage: python shards.py worker HOST PORT'
+Address = Tuple[str, int]
+Record = Tuple[str, date, str, List[Union[int, float]]]
+
+
+class ShardedResult(NamedTuple):
+    """Rendered messages in input order (None for rejected records),
+    the (index, reason) of rejected records and the merged totals."""
+
+    messages: List[Optional[str]]
+    errors: List[Tuple[int, str]]
+    aggregator: Aggregator
+
+
+def shard_of(athlete: str, shards: int) -> int:
+    """Get back the shard of an athlete, the same in every process."""
+    return zlib.crc32(athlete.encode()) % shards
+
+
+def process_records(records: Sequence[Record],
+                    aggregator: Aggregator
+                    ) -> Tuple[List[Optional[str]], List[Tuple[int, str]]]:
+    """Calculates a chunk of records, adding them to aggregator."""
+    messages: List[Optional[str]] = []
+    errors = []
+    for position, (athlete, day, workout_type, data) in enumerate(records):
+        reason = check_package(workout_type, data)
+        if reason is not None:
+            messages.append(None)
+            errors.append((position, reason))
+            continue
+        info = read_package(workout_type, data).show_training_info()
+        aggregator.add(athlete, info, day)
+        messages.append(info.get_message())
+    return messages, errors
+
+
+def serve_coordinator(conn: Connection) -> bool:
+    """Answers a coordinator until it finishes its runs, get back False
+    if it asked the worker to stop."""
+    aggregator = Aggregator()
+    while True:
+        try:
+            command, *payload = conn.recv()
+        except EOFError:
+            return True
+        if command == 'chunk':
+            conn.send(process_records(payload[0], aggregator))
+        elif command == 'done':
+            conn.send(aggregator)
+            aggregator = Aggregator()
+        elif command == 'stop':
+            return False
+
+
+def run_worker(host: str, port: int, authkey: bytes) -> None:
+    """Serves coordinators one at a time until one of them stops the
+    worker. The address is printed once the worker is listening."""
+    with Listener((host, port), authkey=authkey) as listener:
+        address = listener.address
+        print(f'{address[0]}:{address[1]}', flush=True)
+        while True:
+            with listener.accept() as conn:
+                if not serve_coordinator(conn):
+                    return
+
+
+class Coordinator:
+    """Distributes records between workers by athlete.
+
+    Without addresses the coordinator starts the given number of local
+    worker processes and stops them on close().
+    """
+
+    def __init__(self,
+                 workers: int = 2,
+                 addresses: Sequence[Address] = (),
+                 chunk_size: int = 256,
+                 window: int = 4,
+                 authkey: Optional[bytes] = None
+                 ) -> None:
+        if authkey is None:
+            authkey = (bytes.fromhex(os.environ[AUTHKEY_VARIABLE])
+                       if AUTHKEY_VARIABLE in os.environ else os.urandom(16))
+        self.workers = workers
+        self.addresses = list(addresses)
+        self.chunk_size = chunk_size
+        self.window = window
+        self.authkey = authkey
+        self.processes: List[subprocess.Popen] = []
+        self.connections: List[Connection] = []
+
+    def __enter__(self) -> 'Coordinator':
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def spawn(self) -> Address:
+        """Starts a local worker, get back its address."""
+        process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__),
+             'worker', '127.0.0.1', '0'],
+            stdout=subprocess.PIPE,
+            env=dict(os.environ, **{AUTHKEY_VARIABLE: self.authkey.hex()}),
+        )
+        self.processes.append(process)
+        line = process.stdout.readline().decode()
+        if not line:
+            raise RuntimeError(f'Worker exited with code {process.wait()}')
+        host, port = line.strip().rsplit(':', 1)
+        return host, int(port)
+
+    def start(self) -> None:
+        if not self.addresses:
+            self.addresses = [self.spawn() for _ in range(self.workers)]
+        self.connections = [Client(address, authkey=self.authkey)
+                            for address in self.addresses]
+
+    def close(self) -> None:
+        for conn in self.connections:
+            if self.processes:
+                conn.send(('stop',))
+            conn.close()
+        for process in self.processes:
+            process.wait()
+            process.stdout.close()
+        self.connections = []
+        self.processes = []
+
+    def run(self, records: Iterable[Record]) -> ShardedResult:
+        """Processes records on the workers."""
+        run = ShardedRun(self.connections, self.chunk_size, self.window)
+        for record in records:
+            run.add(record)
+        return run.finish()
+
+
+class ShardedRun:
+    """State of a single Coordinator.run(): the messages collected so
+    far, the records buffered for every shard and the indexes of the
+    chunks a worker hasn't answered yet."""
+
+    def __init__(self,
+                 connections: List[Connection],
+                 chunk_size: int,
+                 window: int
+                 ) -> None:
+        self.connections = connections
+        self.chunk_size = chunk_size
+        self.window = window
+        self.messages: List[Optional[str]] = []
+        self.errors: List[Tuple[int, str]] = []
+        self.buffers: List[List[Tuple[int, Record]]] = [
+            [] for _ in connections
+        ]
+        self.in_flight: List[Deque[List[int]]] = [
+            deque() for _ in connections
+        ]
+        self.shard_by_conn: Dict[Connection, int] = {
+            conn: shard for shard, conn in enumerate(connections)
+        }
+
+    def add(self, record: Record) -> None:
+        """Buffers a record, sending its shard once a chunk is full."""
+        shard = shard_of(record[0], len(self.connections))
+        self.buffers[shard].append((len(self.messages), record))
+        self.messages.append(None)
+        if len(self.buffers[shard]) >= self.chunk_size:
+            self.send(shard)
+
+    def receive(self, shard: int) -> None:
+        """Reads the answer to the oldest chunk sent to a shard."""
+        chunk_messages, chunk_errors = self.connections[shard].recv()
+        indexes = self.in_flight[shard].popleft()
+        for index, message in zip(indexes, chunk_messages):
+            self.messages[index] = message
+        self.errors.extend((indexes[position], reason)
+                           for position, reason in chunk_errors)
+
+    def send(self, shard: int) -> None:
+        """Sends the buffer of a shard, reading the answers that are
+        ready first and waiting for the worker while the shard has
+        window chunks in flight."""
+        for conn in wait(self.connections, timeout=0):
+            if self.in_flight[self.shard_by_conn[conn]]:
+                self.receive(self.shard_by_conn[conn])
+        while len(self.in_flight[shard]) >= self.window:
+            self.receive(shard)
+        chunk = self.buffers[shard]
+        self.buffers[shard] = []
+        self.in_flight[shard].append([index for index, _ in chunk])
+        self.connections[shard].send(
+            ('chunk', [record for _, record in chunk])
+        )
+
+    def finish(self) -> ShardedResult:
+        """Sends what is left, collects every answer and merges the
+        aggregators of the workers."""
+        aggregator = Aggregator()
+        for shard, conn in enumerate(self.connections):
+            if self.buffers[shard]:
+                self.send(shard)
+            conn.send(('done',))
+        for shard, conn in enumerate(self.connections):
+            while self.in_flight[shard]:
+                self.receive(shard)
+            aggregator.merge(conn.recv())
+        self.errors.sort()
+        return ShardedResult(self.messages, self.errors, aggregator)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 4 or sys.argv[1] != 'worker':
+        sys.exit(USAGE)
+    if AUTHKEY_VARIABLE not in os.environ:
+        sys.exit(f'Set {AUTHKEY_VARIABLE} to the key of the coordinator')
+    run_worker(sys.argv[2], int(sys.argv[3]),
+               bytes.fromhex(os.environ[AUTHKEY_VARIABLE]))
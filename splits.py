@@ -0,0 +1,94 @@
+"""Per-interval splits of a workout from a stream of sensor samples.
+
+Newer sensor blocks send the number of steps or strokes made during
+each sample interval instead of a single total. Splits keeps a sliding
+window over the latest samples and, for every new sample, gets back the
+distance, mean speed and calories of the window, computed by the same
+Training subclass that handles the whole workout. Updating the window
+costs the same no matter how long it is.
+
+Usage:
+    splits = Splits('RUN', window=60, weight=75)
+    for steps in samples:
+        split = splits.add(steps)
+    info = splits.finish()
+"""
+from collections import deque
+from typing import Deque, Dict, NamedTuple, Tuple
+
+from homework import InfoMessage, Training, get_training_class
+
+SECONDS_IN_HOUR = Training.MIN_IN_HOUR * 60
+# Values that are counted per sample and add up over the workout; the
+# other constructor values (weight, height, length_pool) are constant.
+COUNTED_FIELDS = ('action', 'count_pool')
+
+
+class Split(NamedTuple):
+    """Metrics of the window ending at the given second."""
+
+    end: float
+    distance: float
+    speed: float
+    calories: float
+
+
+class Splits:
+    """Sliding-window metrics over the samples of a single workout."""
+
+    def __init__(self,
+                 workout_type: str,
+                 window: int = 60,
+                 interval: float = 1.0,
+                 **constants: float
+                 ) -> None:
+        if window < 1:
+            raise ValueError('Splits window must contain a sample')
+        self.training_class = get_training_class(workout_type)
+        self.window = window
+        self.interval = interval
+        self.fields = self.training_class.get_fields()
+        self.counted = tuple(name for name in COUNTED_FIELDS
+                             if name in self.fields)
+        missing = [name for name in self.fields
+                   if name not in self.counted and name != 'duration'
+                   and name not in constants]
+        if missing:
+            raise ValueError(f'{self.training_class.__name__} splits need '
+                             f'{tuple(missing)}')
+        self.constants = constants
+        self.samples: Deque[Tuple[float, ...]] = deque()
+        self.window_totals: Dict[str, float] = dict.fromkeys(self.counted, 0)
+        self.totals: Dict[str, float] = dict.fromkeys(self.counted, 0)
+        self.count = 0
+
+    def training(self, counts: Dict[str, float], samples: int) -> Training:
+        """Get back the training made of counts over samples intervals."""
+        values = dict(self.constants, **counts)
+        values['duration'] = samples * self.interval / SECONDS_IN_HOUR
+        return self.training_class(*[values[name] for name in self.fields])
+
+    def add(self, action: float, count_pool: float = 0) -> Split:
+        """Adds the counts of a sample, get back the split of the
+        window ending with it."""
+        sample = {'action': action, 'count_pool': count_pool}
+        values = tuple(sample[name] for name in self.counted)
+        self.samples.append(values)
+        for name, value in zip(self.counted, values):
+            self.window_totals[name] += value
+            self.totals[name] += value
+        if len(self.samples) > self.window:
+            for name, value in zip(self.counted, self.samples.popleft()):
+                self.window_totals[name] -= value
+        self.count += 1
+        info = self.training(self.window_totals,
+                             len(self.samples)).show_training_info()
+        return Split(self.count * self.interval,
+                     info.distance, info.speed, info.calories)
+
+    def finish(self) -> InfoMessage:
+        """Get back the message of the whole workout."""
+        if not self.count:
+            raise ValueError('Splits can not finish a workout without '
+                             'samples')
+        return self.training(self.totals, self.count).show_training_info()
@@ -0,0 +1,92 @@
+from datetime import date, timedelta
+
+import pytest
+
+import homework
+from aggregation import Aggregator
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+]
+START = date(2021, 10, 4)
+
+
+def workouts():
+    for index, package in enumerate(PACKAGES * 5):
+        athlete = 'first' if index % 2 else 'second'
+        yield athlete, homework.read_package(*package), (
+            START + timedelta(days=index)
+        )
+
+
+def test_aggregator_totals():
+    aggregator = Aggregator()
+    expected = {}
+    for athlete, training, day in workouts():
+        aggregator.add(athlete, training, day)
+        expected.setdefault(athlete, []).append(
+            training.show_training_info()
+        )
+    for athlete, infos in expected.items():
+        stats = aggregator.athletes[athlete]
+        calories = [info.calories for info in infos]
+        assert stats.totals.metrics['calories'].total == pytest.approx(
+            sum(calories)
+        ), 'Сумма калорий спортсмена посчитана неверно.'
+        assert stats.totals.metrics['calories'].minimum == min(calories)
+        assert stats.totals.metrics['calories'].maximum == max(calories)
+        assert stats.totals.count == len(infos)
+        assert sum(totals.count for totals in stats.by_type.values()) == (
+            len(infos)
+        )
+
+
+def test_aggregator_windows():
+    aggregator = Aggregator(keep_days=3, keep_weeks=2)
+    for athlete, training, day in workouts():
+        aggregator.add(athlete, training, day)
+    stats = aggregator.athletes['first']
+    assert len(stats.daily.periods) <= 3, (
+        'Должны храниться только последние дни.'
+    )
+    assert len(stats.weekly.periods) <= 2
+    last_day = START + timedelta(days=len(PACKAGES) * 5 - 1)
+    assert stats.daily.get(last_day).count == 1
+    assert stats.daily.get(START) is None
+
+
+def test_aggregator_merge():
+    whole = Aggregator()
+    parts = [Aggregator(), Aggregator()]
+    for index, (athlete, training, day) in enumerate(workouts()):
+        whole.add(athlete, training, day)
+        parts[index % 3 == 0].add(athlete, training.show_training_info(),
+                                  day)
+    merged = parts[0].merge(parts[1])
+    for athlete, stats in whole.athletes.items():
+        for name, summary in stats.totals.metrics.items():
+            other = merged.athletes[athlete].totals.metrics[name]
+            assert other.count == summary.count
+            assert other.total == pytest.approx(summary.total)
+            assert (other.minimum, other.maximum) == (
+                summary.minimum, summary.maximum
+            ), 'Объединение частичных агрегатов посчитано неверно.'
+        assert set(merged.athletes[athlete].daily.periods) == set(
+            stats.daily.periods
+        )
+
+
+def test_aggregator_late_workouts():
+    aggregator = Aggregator(keep_days=3)
+    info = homework.read_package('RUN', [15000, 1, 75]).show_training_info()
+    for day in (10, 11, 12, 1, 2, 11):
+        aggregator.add('first', info, date(2021, 10, day))
+    daily = aggregator.athletes['first'].daily
+    assert sorted(daily.periods) == [
+        daily.period(date(2021, 10, day)) for day in (10, 11, 12)
+    ], 'Опоздавшие тренировки не должны возвращать истёкшие дни.'
+    assert daily.get(date(2021, 10, 11)).count == 2
+    assert aggregator.athletes['first'].totals.count == 6
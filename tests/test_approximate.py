@@ -0,0 +1,107 @@
+import random
+import struct
+
+import pytest
+
+import homework
+from approximate import CompactMetrics, max_deviation
+
+RANGES = {
+    'action': (1, 50000),
+    'duration': (0.1, 5),
+    'weight': (30, 150),
+    'height': (120, 210),
+    'length_pool': (10, 50),
+    'count_pool': (1, 200),
+}
+
+
+def float32(value):
+    return struct.unpack('f', struct.pack('f', value))[0]
+
+
+def random_packages(count):
+    generator = random.Random(23)
+    packages = []
+    for _ in range(count):
+        workout_type = generator.choice(['RUN', 'WLK', 'SWM'])
+        training_class = homework.TRAINING_TYPES[workout_type]
+        data = []
+        for name in training_class.get_fields():
+            low, high = RANGES[name]
+            data.append(generator.choice((
+                generator.randint(max(1, int(low)), int(high)),
+                generator.uniform(low, high),
+            )))
+        packages.append((workout_type, data))
+    return packages
+
+
+def walking_boundary_packages():
+    packages = []
+    for action in range(9000, 9500):
+        speed = action * homework.Training.LEN_STEP / homework.Training.M_IN_KM
+        for quotient in range(1, 6):
+            packages.append(('WLK', [action, 1.0, 75, speed ** 2 / quotient]))
+    return packages
+
+
+def check_deviation(packages, backend):
+    batch = homework.TrainingBatch(packages)
+    metrics = CompactMetrics(backend).extend(*batch.calculate())
+    assert metrics.nbytes == len(packages) * 3 * 4, (
+        'Значения должны занимать вдвое меньше памяти, чем float64.'
+    )
+    for index, package in enumerate(packages):
+        info = homework.read_package(*package).show_training_info()
+        expected = (info.distance, info.speed, info.calories)
+        for value, reference in zip(metrics[index], expected):
+            assert abs(value - reference) <= max_deviation(
+                backend, reference
+            ), 'Отклонение должно оставаться в заявленных пределах.'
+    return metrics
+
+
+@pytest.mark.parametrize('backend', ['milli', 'float32'])
+def test_compact_metrics_deviation(backend):
+    check_deviation(random_packages(3000), backend)
+    check_deviation(walking_boundary_packages(), backend)
+
+
+def test_compact_metrics_messages():
+    packages = random_packages(3000)
+    metrics = check_deviation(packages, 'milli')
+    for index, package in enumerate(packages):
+        info = homework.read_package(*package).show_training_info()
+        compact = homework.InfoMessage(info.training_type, info.duration,
+                                       *metrics[index])
+        assert compact.get_message() == info.get_message()
+
+
+def test_walking_floor_needs_float64_values():
+    flips = 0
+    for workout_type, data in walking_boundary_packages():
+        reference = homework.SportsWalking(*data).get_spent_calories()
+        rounded = homework.SportsWalking(
+            *[float32(value) for value in data]
+        ).get_spent_calories()
+        flips += abs(rounded - reference) > 1
+    assert flips, (
+        'Округление пакетов до float32 до расчёта меняет целую часть '
+        'в формуле калорий спортивной ходьбы.'
+    )
+
+
+def test_compact_metrics_backend():
+    with pytest.raises(ValueError):
+        CompactMetrics('float16')
+    with pytest.raises(OverflowError):
+        CompactMetrics().extend([3e6], [0], [0])
+    metrics = CompactMetrics('milli').extend([1.2345], [0.0005], [-81.3203])
+    assert metrics.column('distance') == [1.234]
+    assert metrics[0] == (1.234, 0.001, -81.32)
+    with pytest.raises(OverflowError):
+        metrics.extend([1, 2], [1, 2], [1, 3e6])
+    assert [len(column) for column in metrics.columns.values()] == [
+        1, 1, 1
+    ], 'Ошибка переполнения не должна оставлять столбцы разной длины.'
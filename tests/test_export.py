@@ -0,0 +1,96 @@
+import csv
+import io
+import json
+
+import pytest
+
+import homework
+import export
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+]
+
+
+@pytest.fixture
+def messages():
+    return [homework.read_package(*package).show_training_info()
+            for package in PACKAGES]
+
+
+def as_rows(messages):
+    return [(message.training_type, float(message.duration),
+             message.distance, message.speed, message.calories)
+            for message in messages]
+
+
+def test_csv_writer(messages):
+    out = io.StringIO()
+    assert export.CsvWriter(out, chunk_size=3).write(messages) == 4
+    rows = list(csv.reader(io.StringIO(out.getvalue())))
+    assert rows[0] == list(export.FIELDS)
+    assert [(name, *map(float, values)) for name, *values in rows[1:]] == (
+        as_rows(messages)
+    ), 'CSV должен содержать точные значения, а не округлённые строки.'
+
+
+def test_json_lines_writer(messages):
+    out = io.StringIO()
+    export.JsonLinesWriter(out, chunk_size=3).write(messages)
+    rows = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [tuple(row[name] for name in export.FIELDS) for row in rows] == (
+        as_rows(messages)
+    )
+
+
+def test_json_lines_writer_non_finite():
+    huge = homework.InfoMessage('Running', 1, 1e308, 1e308, 1e308)
+    out = io.StringIO()
+    export.JsonLinesWriter(out).write([huge])
+    assert json.loads(out.getvalue())['calories'] == 1e308
+    for value in (float('inf'), float('nan')):
+        message = homework.InfoMessage('Running', 1, value, 1.0, 1.0)
+        with pytest.raises(ValueError):
+            export.JsonLinesWriter(io.StringIO()).write([message])
+    message = homework.read_package(
+        'RUN', [float('inf'), 1, 75]
+    ).show_training_info()
+    with pytest.raises(ValueError, match='JSON'):
+        export.JsonLinesWriter(io.StringIO()).write([message])
+
+
+def test_columnar_writer(messages):
+    out = io.BytesIO()
+    writer = export.ColumnarWriter(out, chunk_size=3)
+    writer.write(messages)
+    distance, speed, calories = homework.calculate_batch(
+        ['RUN', 'SWM'], [15000, 720], [1, 1], [75, 80],
+        length_pool=[0, 25], count_pool=[0, 40],
+    )
+    writer.write_columns({
+        'training_type': ['Running', 'Swimming'],
+        'duration': [1, 1],
+        'distance': distance,
+        'speed': speed,
+        'calories': calories,
+    })
+    out.seek(0)
+    blocks = list(export.read_columnar(out))
+    assert [len(block['training_type']) for block in blocks] == [3, 1, 2]
+    rows = [row for block in blocks
+            for row in zip(*[block[name] for name in export.FIELDS])]
+    assert rows == as_rows(messages) + as_rows([messages[1], messages[0]])
+
+
+@pytest.mark.parametrize('extension', ['csv', 'jsonl', 'col'])
+def test_export(tmp_path, messages, extension):
+    path = str(tmp_path / f'results.{extension}')
+    assert export.export(messages, path) == len(messages)
+
+
+def test_export_unknown_format(tmp_path, messages):
+    with pytest.raises(ValueError):
+        export.export(messages, str(tmp_path / 'results.xls'))
@@ -1,4 +1,6 @@
+import io
 import pytest
+import random
 import types
 import inspect
 from conftest import Capturing
@@ -384,3 +386,462 @@ def test_main_output(input_data, expected):
     assert get_message_output == expected, (
         'Метод `main` должен печатать результат в консоль.\n'
     )
+
+
+def test_calculate_batch():
+    packages = [
+        ('SWM', [720, 1, 80, 25, 40]),
+        ('RUN', [15000, 1, 75]),
+        ('WLK', [9000, 1, 75, 180]),
+        ('RUN', [1206, 12, 6]),
+        ('WLK', [420, 4, 20, 42]),
+        ('SWM', [1206, 12, 6, 12, 6]),
+        ('WLK', [1206, 12, 6, 12]),
+    ]
+    columns = {
+        'action': [], 'duration': [], 'weight': [],
+        'height': [], 'length_pool': [], 'count_pool': [],
+    }
+    fields = {
+        'SWM': ('action', 'duration', 'weight', 'length_pool', 'count_pool'),
+        'RUN': ('action', 'duration', 'weight'),
+        'WLK': ('action', 'duration', 'weight', 'height'),
+    }
+    for workout_type, data in packages:
+        row = dict(zip(fields[workout_type], data))
+        for name, column in columns.items():
+            column.append(row.get(name, 0))
+    workout_types = [workout_type for workout_type, _ in packages]
+    distance, speed, calories = homework.calculate_batch(
+        workout_types, **columns
+    )
+    for index, package in enumerate(packages):
+        info = homework.read_package(*package).show_training_info()
+        assert (distance[index], speed[index], calories[index]) == (
+            info.distance, info.speed, info.calories
+        ), (
+            'Функция `calculate_batch` должна давать те же результаты, '
+            'что и классы тренировок.'
+        )
+
+
+def test_calculate_batch_wrong_type():
+    with pytest.raises(ValueError):
+        homework.calculate_batch(['BOX'], [1], [1], [1])
+    with pytest.raises(ValueError, match='height'):
+        homework.calculate_batch(['WLK'], [1], [1], [1])
+
+
+def test_read_packages():
+    lines = [
+        'SWM,720,1,80,25,40\n',
+        '\n',
+        '["RUN", [15000, 1, 75]]\n',
+        '{"workout_type": "WLK", "data": [9000, 1.5, 75, 180]}\n',
+    ]
+    result = list(homework.read_packages(lines))
+    assert result == [
+        ('SWM', [720, 1, 80, 25, 40]),
+        ('RUN', [15000, 1, 75]),
+        ('WLK', [9000, 1.5, 75, 180]),
+    ], (
+        'Функция `read_packages` должна читать пакеты в форматах '
+        'CSV и JSON lines.'
+    )
+
+
+def test_process_packages():
+    packages = [
+        ('SWM', [720, 1, 80, 25, 40]),
+        ('RUN', [15000, 1, 75]),
+        ('WLK', [9000, 1, 75, 180]),
+    ] * 3
+    result = homework.process_packages(packages, buffer_size=2)
+    assert isinstance(result, types.GeneratorType), (
+        'Функция `process_packages` должна обрабатывать пакеты лениво.'
+    )
+    expected = [
+        homework.read_package(*package).show_training_info().get_message()
+        for package in packages
+    ]
+    assert [info.get_message() for info in result] == expected
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_process_packages_parallel(ordered):
+    packages = [
+        ('SWM', [720, 1, 80, 25, 40]),
+        ('RUN', [15000, 1, 75]),
+        ('WLK', [9000, 1, 75, 180]),
+        ('RUN', [1206, 12, 6]),
+    ] * 5
+    expected = [homework.read_package(*package).show_training_info()
+                for package in packages]
+    result = list(homework.process_packages_parallel(
+        packages, workers=2, chunk_size=3, ordered=ordered
+    ))
+    if not ordered:
+        result = sorted(result, key=expected.index)
+        expected = sorted(expected, key=expected.index)
+    assert result == expected, (
+        'Функция `process_packages_parallel` должна возвращать те же '
+        'сообщения, что и последовательная обработка.'
+    )
+
+
+def test_InfoMessage_slots():
+    info_message = homework.InfoMessage('Running', 1, 2, 3, 4)
+    assert not hasattr(info_message, '__dict__'), (
+        'Объекты `InfoMessage` не должны хранить атрибуты в `__dict__`.'
+    )
+
+
+def test_TrainingBatch():
+    packages = [
+        ('SWM', [720, 1, 80, 25, 40]),
+        ('RUN', [15000, 1, 75]),
+        ('WLK', [9000, 1, 75, 180]),
+    ]
+    batch = homework.TrainingBatch(packages)
+    assert len(batch) == len(packages)
+    distance, speed, calories = batch.calculate()
+    for index, package in enumerate(packages):
+        training = batch[index]
+        expected = homework.read_package(*package)
+        assert type(training) is type(expected), (
+            'Строка `TrainingBatch` должна возвращаться как объект '
+            'класса тренировки.'
+        )
+        info = expected.show_training_info()
+        assert training.show_training_info().get_message() == (
+            info.get_message()
+        )
+        assert (distance[index], speed[index], calories[index]) == (
+            info.distance, info.speed, info.calories
+        )
+
+
+def test_Training_metrics_cached(monkeypatch):
+    running = homework.Running(9000, 1, 75)
+    calls = []
+    original = homework.Running.LEN_STEP
+
+    class CountingStep(float):
+        def __rmul__(self, other):
+            calls.append(other)
+            return other * original
+
+    monkeypatch.setattr(homework.Running, 'LEN_STEP', CountingStep(original))
+    homework.Running.get_formulas()
+    info = running.show_training_info()
+    assert len(calls) == 1, (
+        'Дистанция должна вычисляться один раз на тренировку.'
+    )
+    assert info.calories == 383.85
+    running.duration = 2
+    assert running.get_mean_speed() == 2.925, (
+        'Изменение параметров тренировки должно сбрасывать '
+        'сохранённые значения.'
+    )
+    assert len(calls) == 2
+
+
+def test_render_messages():
+    messages = [
+        homework.InfoMessage('Swimming', 1, 75, 1, 80),
+        homework.InfoMessage('Running', 4, 20, 4, 20),
+        homework.InfoMessage('SportsWalking', 12.5, 6.1234, 12, -6.0005),
+    ]
+    expected = ''.join(message.get_message() + '\n' for message in messages)
+    assert homework.render_messages(messages) == expected, (
+        'Функция `render_messages` должна выводить те же строки, '
+        'что и `InfoMessage.get_message`.'
+    )
+    assert homework.render_messages([]) == ''
+
+
+def test_printf_template():
+    template, names = homework.printf_template('{name}: {value:.3f} %')
+    assert template == '%s: %.3f %%'
+    assert names == ('name', 'value')
+
+
+def test_read_package_registry(monkeypatch):
+    monkeypatch.setattr(homework, 'TRAINING_TYPES',
+                        dict(homework.TRAINING_TYPES))
+
+    class Cycling(homework.Training, code='CYC'):
+        def get_spent_calories(self) -> float:
+            return self.get_mean_speed() * self.weight
+
+    assert homework.TRAINING_TYPES['CYC'] is Cycling
+    result = homework.read_package('CYC', [3000, 1, 80])
+    assert isinstance(result, Cycling), (
+        'Новые виды тренировок должны регистрироваться '
+        'без изменения `read_package`.'
+    )
+    with pytest.raises(ValueError):
+        class Rowing(homework.Training, code='CYC'):
+            pass
+
+
+def test_plugin_fields_stored_under_other_names(monkeypatch):
+    monkeypatch.setattr(homework, 'TRAINING_TYPES',
+                        dict(homework.TRAINING_TYPES))
+
+    class Cycling(homework.Training, code='CYC'):
+        def __init__(self, action, duration, weight, bike_weight) -> None:
+            super().__init__(action, duration, weight)
+            self.bike = bike_weight
+
+        def get_spent_calories(self) -> float:
+            return self.get_mean_speed() * (self.weight + self.bike)
+
+    assert homework.check_package('CYC', [3000, 1, 80, 10]) is None
+    info = homework.read_package('CYC', [3000, 1, 80, 10]).show_training_info()
+    assert info.calories == 1.95 * 90, (
+        'Поля новых видов тренировок могут храниться под другими именами.'
+    )
+
+
+@pytest.mark.parametrize('input_data', [
+    ('RUN', [15000, 1]),
+    ('WLK', [9000, 1, 75]),
+    ('SWM', [720, 1, 80, 25, 40, 1]),
+    ('BOX', [1, 1, 1]),
+])
+def test_read_package_wrong_package(input_data):
+    with pytest.raises(ValueError):
+        homework.read_package(*input_data)
+
+
+def test_PackageCache():
+    cache = homework.PackageCache(maxsize=2)
+    first = cache.get('RUN', [15000, 1, 75])
+    assert cache.get('RUN', [15000, 1, 75]) is first, (
+        'Повторный пакет должен возвращаться из кеша.'
+    )
+    assert cache.get_message('RUN', (15000, 1, 75)) == first.get_message()
+    cache.get('SWM', [720, 1, 80, 25, 40])
+    cache.get('WLK', [9000, 1, 75, 180])
+    assert cache.stats() == {
+        'hits': 2, 'misses': 3, 'evictions': 1, 'size': 2, 'maxsize': 2,
+    }, 'Статистика кеша посчитана неверно.'
+    assert cache.get('RUN', [15000, 1, 75]) is not first
+    with pytest.raises(ValueError):
+        cache.get('BOX', [1, 1, 1])
+
+
+def test_process_packages_cache():
+    packages = [('RUN', [15000, 1, 75]), ('WLK', [9000, 1, 75, 180])] * 3
+    cache = homework.PackageCache()
+    result = list(homework.process_packages(packages, cache=cache))
+    assert [info.get_message() for info in result] == [
+        homework.read_package(*package).show_training_info().get_message()
+        for package in packages
+    ]
+    assert (cache.hits, cache.misses) == (4, 2)
+
+
+@pytest.mark.parametrize('argv, expected', [
+    (['RUN', '15000', '1', '75'], [
+        'Тип тренировки: Running; '
+        'Длительность: 1.000 ч.; '
+        'Дистанция: 9.750 км; '
+        'Ср. скорость: 9.750 км/ч; '
+        'Потрачено ккал: 699.750.'
+    ]),
+    ([], [
+        homework.read_package(*package).show_training_info().get_message()
+        for package in homework.SAMPLE_PACKAGES
+    ]),
+])
+def test_run_cli(argv, expected):
+    out = io.StringIO()
+    assert homework.run_cli(argv, stdout=out) == 0
+    assert out.getvalue().splitlines() == expected
+
+
+def test_run_cli_batch():
+    stdin = io.StringIO('RUN,15000,1,75\n["RUN", [1, 0, 75]]\nBOX,1,1,1\n')
+    out = io.StringIO()
+    assert homework.run_cli(['--batch'], stdin=stdin, stdout=out) == 0
+    lines = out.getvalue().splitlines()
+    assert len(lines) == 3, (
+        'В режиме `--batch` на каждую строку должен быть ответ.'
+    )
+    assert lines[0] == homework.read_package(
+        'RUN', [15000, 1, 75]
+    ).show_training_info().get_message()
+    assert lines[1].startswith('error: ')
+    assert lines[2].startswith('error: ')
+
+
+def test_run_cli_batch_survives_errors():
+    stdin = io.StringIO('[["RUN"], [1, 1, 1]]\n'
+                        f'RUN,{10 ** 400},1,75\n'
+                        'WLK,1e308,1,75,180\n'
+                        'RUN,15000,1,75\n')
+    out = io.StringIO()
+    assert homework.run_cli(['--batch'], stdin=stdin, stdout=out) == 0
+    lines = out.getvalue().splitlines()
+    assert [line.startswith('error: ') for line in lines] == [
+        True, True, True, False
+    ], 'Ошибка в одной строке не должна останавливать режим `--batch`.'
+
+
+def test_run_cli_error():
+    assert homework.run_cli(['RUN', '15000']) == 1
+    assert homework.run_cli(['WLK', '1e308', '1', '75', '180']) == 1
+
+
+@pytest.mark.parametrize('input_data, reason', [
+    (('RUN', [15000, 1, 75]), None),
+    (('WLK', [9000, 1.5, 75, 180]), None),
+    (('SWM', [0, 1, 80, 0, 0]), None),
+    (('RUN', [15000, 0, 75]), 'duration must be positive, got 0'),
+    (('RUN', [15000, 1, -75]), 'weight must be positive, got -75'),
+    (('WLK', [9000, 1, 75, 0]), 'height must be positive, got 0'),
+    (('SWM', [720, 1, 80, -25, 40]), 'length_pool must not be negative, '
+                                     'got -25'),
+    (('RUN', [15000, '1', 75]), "duration must be a number, got '1'"),
+    (('RUN', [15000, True, 75]), 'duration must be a number, got True'),
+    (('RUN', [15000, float('nan'), 75]), 'duration must be positive, '
+                                         'got nan'),
+    (('RUN', [15000, 1]), "Running needs 3 values "
+                          "('action', 'duration', 'weight'), got 2"),
+    (('RUN', 15000), 'package values must be a list, got 15000'),
+    (('BOX', [1, 1, 1]), "unknown WORKOUT_TYPE 'BOX'"),
+    ((['RUN'], [1, 1, 1]), "WORKOUT_TYPE must be a string, got ['RUN']"),
+    (('RUN', [10 ** 400, 1, 75]), f'action must be finite, got {10 ** 400}'),
+    (('RUN', [15000, float('inf'), 75]), 'duration must be finite, '
+                                         'got inf'),
+])
+def test_check_package(input_data, reason):
+    assert homework.check_package(*input_data) == reason, (
+        'Функция `check_package` должна объяснять, '
+        'почему пакет нельзя обработать.'
+    )
+
+
+def test_process_packages_rejects():
+    packages = [
+        ('RUN', [15000, 1, 75]),
+        ('RUN', [15000, 0, 75]),
+        ('WLK', [9000, 1, 75, 0]),
+        ('SWM', [720, 1, 80, 25, 40]),
+    ]
+    rejects = []
+    result = list(homework.process_packages(packages, rejects=rejects))
+    assert [info.training_type for info in result] == [
+        'Running', 'Swimming'
+    ]
+    assert [package for package, _ in rejects] == packages[1:3], (
+        'Ошибочные пакеты должны попадать в `rejects`.'
+    )
+
+
+@pytest.mark.parametrize('workout_type', ['RUN', 'WLK', 'SWM'])
+def test_compiled_formulas_match_methods(workout_type):
+    training_class = homework.TRAINING_TYPES[workout_type]
+    calculate, calculate_columns, _ = training_class.get_formulas()
+    generator = random.Random(workout_type)
+    rows = [
+        [generator.choice((generator.randint(1, 50000),
+                           generator.uniform(0.01, 500)))
+         for _ in training_class.get_fields()]
+        for _ in range(1000)
+    ] + [[1206, 12, 6, 12, 6][:training_class.ARITY]]
+    expected = []
+    for row in rows:
+        training = training_class(*row)
+        expected.append((training.get_distance(),
+                         training.get_mean_speed(),
+                         training.get_spent_calories()))
+        assert calculate(training_class(*row)) == expected[-1], (
+            'Скомпилированные формулы должны давать те же результаты, '
+            'что и методы класса.'
+        )
+    assert list(zip(*calculate_columns(*zip(*rows)))) == expected
+
+
+def test_compiled_formulas_fallback(monkeypatch):
+    class FastRunning(homework.Running):
+        def get_spent_calories(self) -> float:
+            return 1.0
+
+    class CappedRunning(homework.Running):
+        def get_spent_calories(self) -> float:
+            if self.duration > 1:
+                return 0.0
+            return super().get_spent_calories()
+
+    assert FastRunning.get_formulas()[0](FastRunning(15000, 1, 75)) == (
+        9.75, 9.75, 1.0
+    ), 'Формулы должны строиться из переопределённых методов.'
+    assert CappedRunning.get_formulas() is None, (
+        'Методы, которые нельзя развернуть, должны вызываться как есть.'
+    )
+    for training_class in (FastRunning, CappedRunning):
+        assert training_class.calculate_columns(
+            {'action': [15000], 'duration': [2], 'weight': [75]}
+        ) == ([9.75], [4.875], [1.0 if training_class is FastRunning else 0])
+    monkeypatch.setattr(homework.Running, 'RUN_COEFF_CALORIE_2', 0)
+    info = homework.Running(15000, 1, 75).show_training_info()
+    assert info.calories == 18 * 9.75 * 75 / 1000 * 60, (
+        'Изменение констант класса должно пересобирать формулы.'
+    )
+
+
+def test_compiled_formulas_after_workouts(monkeypatch):
+    monkeypatch.setattr(homework, 'SPECIALIZE_AFTER', 2)
+    monkeypatch.setattr(homework, 'WORKOUTS', {})
+    monkeypatch.setattr(homework, 'FORMULAS', {})
+    homework.Running(15000, 1, 75).show_training_info()
+    assert homework.Running not in homework.FORMULAS, (
+        'Первые тренировки должны считаться методами класса.'
+    )
+    homework.Running(15000, 1, 75).show_training_info()
+    assert homework.FORMULAS[homework.Running] is not None
+
+
+def test_compiled_formulas_instance_overrides():
+    homework.Running.get_formulas()
+    running = homework.Running(15000, 1, 75)
+    running.get_spent_calories = lambda: 100.0
+    assert running.show_training_info().calories == 100.0, (
+        'Переопределённые у объекта методы должны учитываться.'
+    )
+    running = homework.Running(15000, 1, 75)
+    running.LEN_STEP = 2
+    assert running.show_training_info().distance == 30.0, (
+        'Переопределённые у объекта константы должны учитываться.'
+    )
+
+
+def test_compiled_formulas_other_attributes(monkeypatch):
+    monkeypatch.setattr(homework, 'TRAINING_TYPES',
+                        dict(homework.TRAINING_TYPES))
+
+    class Cycling(homework.Training, code='CYC'):
+        GEAR = (2, 3)
+
+        def __init__(self, action, duration, weight, bike_weight) -> None:
+            super().__init__(action, duration, weight)
+            self.bike = bike_weight
+
+        def get_spent_calories(self) -> float:
+            return self.get_mean_speed() * (self.weight + self.bike)
+
+        def get_distance(self) -> float:
+            """Distance in km."""
+            turns: float = self.action * self.GEAR[1]
+            turns += max(self.GEAR)
+            return turns / self.M_IN_KM
+
+    calculate, calculate_columns, overrides = Cycling.get_formulas()
+    assert calculate(Cycling(1000, 2, 80, 10)) == (3.003, 1.5015, 135.135)
+    assert calculate_columns is None, (
+        'Столбцы нельзя считать по формулам, читающим другие атрибуты.'
+    )
+    assert {'GEAR', 'M_IN_KM'} <= overrides
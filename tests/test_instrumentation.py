@@ -0,0 +1,89 @@
+import io
+from datetime import date
+
+import pytest
+
+import homework
+import pipeline
+import shards
+from aggregation import Aggregator
+from instrumentation import Instrumentation
+from pipeline import Pipeline
+from shards import process_records
+
+
+def test_instrumentation_counts_stages():
+    instrumentation = Instrumentation()
+    original = homework.read_package
+    with instrumentation.enabled():
+        assert homework.read_package is not original
+        for package in [('RUN', [15000, 1, 75]), ('WLK', [9000, 1, 75, 180])]:
+            homework.read_package(*package).show_training_info().get_message()
+        with pytest.raises(ValueError):
+            homework.read_package('BOX', [1, 1, 1])
+    assert homework.read_package is original, (
+        'После отключения должны возвращаться исходные функции.'
+    )
+    homework.read_package('RUN', [15000, 1, 75]).show_training_info()
+    snapshot = instrumentation.snapshot()
+    assert snapshot['read_package']['count'] == 3
+    assert snapshot['read_package']['errors'] == 1
+    assert snapshot['show_training_info']['count'] == 2
+    assert snapshot['get_message']['count'] == 2
+    assert snapshot['get_message']['buckets']['+Inf'] == 2
+
+
+def test_instrumentation_prometheus():
+    instrumentation = Instrumentation()
+    with instrumentation.enabled():
+        homework.read_package('SWM', [720, 1, 80, 25, 40])
+    text = instrumentation.prometheus()
+    assert '# TYPE homework_stage_seconds histogram' in text
+    assert ('homework_stage_seconds_count{stage="read_package"} 1'
+            in text.splitlines())
+    assert ('homework_stage_seconds_bucket{stage="read_package",le="+Inf"} 1'
+            in text.splitlines())
+
+
+def test_instrumentation_reaches_imported_functions():
+    instrumentation = Instrumentation()
+    lines = ['RUN,15000,1,75'] * 10
+    with instrumentation.enabled():
+        out = io.StringIO()
+        assert Pipeline().run([lines], out) == 10
+        process_records([('athlete', date(2021, 10, 1), 'WLK',
+                          [9000, 1, 75, 180])], Aggregator())
+    snapshot = instrumentation.snapshot()
+    assert snapshot['read_package']['count'] == 11, (
+        'Функции, импортированные другими модулями, тоже должны '
+        'замеряться.'
+    )
+    assert snapshot['show_training_info']['count'] == 11
+    assert snapshot['get_message']['count'] == 1
+    assert snapshot['write_messages']['count'] >= 1
+    assert pipeline.read_package is homework.read_package
+    assert shards.read_package is homework.read_package
+
+
+def test_instrumentation_overlapping():
+    originals = (homework.read_package, homework.write_messages,
+                 pipeline.read_package, pipeline.write_messages)
+    first, second = Instrumentation(), Instrumentation()
+    first.enable()
+    homework.read_package('RUN', [15000, 1, 75])
+    second.enable()
+    homework.read_package('RUN', [15000, 1, 75])
+    first.disable()
+    assert homework.read_package is not originals[0], (
+        'Пока включён другой объект, обёртки должны оставаться.'
+    )
+    homework.read_package('RUN', [15000, 1, 75])
+    second.disable()
+    assert (homework.read_package, homework.write_messages,
+            pipeline.read_package, pipeline.write_messages) == originals, (
+        'После отключения всех объектов должны возвращаться исходные '
+        'функции.'
+    )
+    assert first.snapshot()['read_package']['count'] == 2
+    assert second.snapshot()['read_package']['count'] == 2
+    assert not first.is_enabled and not second.is_enabled
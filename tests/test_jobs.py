@@ -0,0 +1,115 @@
+import json
+
+import pytest
+
+import homework
+import jobs
+
+LINES = [
+    'SWM,720,1,80,25,40',
+    'RUN,15000,1,75',
+    'WLK,9000,1,75,180',
+    'RUN,1206,12,6',
+    'RUN,1,0,75',
+]
+
+
+def expected_lines(lines):
+    return [info.get_message() for info in homework.process_packages(
+        homework.read_packages(lines), rejects=[]
+    )]
+
+
+@pytest.fixture
+def paths(tmp_path):
+    source = tmp_path / 'archive.csv'
+    source.write_text('\n'.join(LINES * 20) + '\n', encoding='utf-8')
+    return (str(source), str(tmp_path / 'out.txt'),
+            str(tmp_path / 'checkpoint.json'))
+
+
+def test_batch_job(paths):
+    totals = jobs.BatchJob(*paths, chunk_size=7, checkpoint_every=2).run()
+    with open(paths[1], encoding='utf-8') as out:
+        assert out.read().splitlines() == expected_lines(LINES * 20)
+    assert totals['Running'].count == 40
+    with open(paths[2], encoding='utf-8') as file:
+        state = json.load(file)
+    assert state['complete'] and state['rejected'] == 20
+    with open(paths[2] + '.chunks', encoding='utf-8') as log:
+        assert len(log.read().split()) == 15
+
+
+def test_batch_job_resume(paths, monkeypatch):
+    original = jobs.BatchJob.process_chunk
+    calls = []
+
+    def failing(self, lines, out):
+        calls.append(len(lines))
+        original(self, lines, out)
+        if len(calls) == 6:
+            raise OSError('disk failure')
+
+    monkeypatch.setattr(jobs.BatchJob, 'process_chunk', failing)
+    with pytest.raises(OSError):
+        jobs.BatchJob(*paths, chunk_size=7, checkpoint_every=4).run()
+    monkeypatch.setattr(jobs.BatchJob, 'process_chunk', original)
+    job = jobs.BatchJob(*paths, chunk_size=7, checkpoint_every=4)
+    totals = job.run()
+    with open(paths[1], encoding='utf-8') as out:
+        assert out.read().splitlines() == expected_lines(LINES * 20), (
+            'После возобновления результаты не должны повторяться.'
+        )
+    assert totals['Running'].count == 40
+    assert totals['Swimming'].metrics['calories'].total == pytest.approx(
+        336 * 20
+    )
+    assert job.rejected == 20
+    with open(paths[2] + '.chunks', encoding='utf-8') as log:
+        assert len(log.read().splitlines()) == 15, (
+            'Журнал частей не должен содержать повторов после '
+            'возобновления.'
+        )
+
+
+def test_batch_job_unreadable_lines(paths):
+    lines = LINES[:2] + [
+        'RUN,15000,x,75', '["RUN"]', '[["RUN"], [1, 1, 1]]',
+        f'RUN,{10 ** 400},1,75', 'WLK,1e308,1,75,180'
+    ] + LINES[2:]
+    with open(paths[0], 'w', encoding='utf-8') as archive:
+        archive.write('\n'.join(lines) + '\n')
+    job = jobs.BatchJob(*paths, chunk_size=3)
+    totals = job.run()
+    with open(paths[1], encoding='utf-8') as out:
+        assert out.read().splitlines() == expected_lines(LINES), (
+            'Нечитаемые строки не должны останавливать обработку.'
+        )
+    assert job.rejected == 6
+    assert totals['Running'].count == 2
+
+
+def test_batch_job_appended_archive(paths):
+    jobs.BatchJob(*paths, chunk_size=7).run()
+    job = jobs.BatchJob(*paths, chunk_size=7)
+    job.run()
+    with open(paths[0], 'a', encoding='utf-8') as archive:
+        archive.write('\n'.join(LINES * 2) + '\n')
+    totals = jobs.BatchJob(*paths, chunk_size=7).run()
+    with open(paths[1], encoding='utf-8') as out:
+        assert out.read().splitlines() == expected_lines(LINES * 22), (
+            'Повторный запуск должен обрабатывать только новые пакеты.'
+        )
+    assert totals['Running'].count == 44
+
+
+def test_batch_job_skips_known_chunks(paths, tmp_path):
+    jobs.BatchJob(*paths, chunk_size=5).run()
+    bigger = tmp_path / 'bigger.csv'
+    bigger.write_text('\n'.join(LINES * 22) + '\n', encoding='utf-8')
+    job = jobs.BatchJob(str(bigger), *paths[1:], chunk_size=5)
+    totals = job.run()
+    assert job.skipped == 20
+    with open(paths[1], encoding='utf-8') as out:
+        assert out.read().splitlines() == expected_lines(LINES * 22)
+    assert totals['Running'].count == 44
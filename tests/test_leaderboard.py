@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+import homework
+from leaderboard import Leaderboard
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+    ('WLK', [420, 4, 20, 42]),
+]
+
+
+def test_leaderboard_top_and_between():
+    leaderboard = Leaderboard(k=2)
+    for index, package in enumerate(PACKAGES):
+        leaderboard.add(homework.read_package(*package), index, key=index)
+    assert [entry.key for entry in leaderboard.top('calories')] == [1, 0]
+    assert [entry.key for entry in leaderboard.top('calories', k=4)] == [
+        1, 0, 4, 2
+    ]
+    assert [entry.key for entry in leaderboard.top(
+        'speed', training_type='Running'
+    )] == [1, 3]
+    assert [entry.key for entry in leaderboard.between(
+        'speed', 1, 6
+    )] == [0, 2]
+    with pytest.raises(ValueError):
+        leaderboard.top('height')
+
+
+def test_leaderboard_expiry():
+    leaderboard = Leaderboard(k=1, ttl=10)
+    leaderboard.add(homework.read_package(*PACKAGES[1]), 0, key='old')
+    leaderboard.add(homework.read_package(*PACKAGES[3]), 5, key='new')
+    assert [entry.key for entry in leaderboard.top('calories')] == ['old']
+    assert [entry.key for entry in leaderboard.top(
+        'calories', now=10
+    )] == ['new'], (
+        'Устаревшие тренировки должны удаляться из рейтинга.'
+    )
+    leaderboard.add(homework.read_package(*PACKAGES[0]), 20)
+    assert len(leaderboard) == 1
+    assert leaderboard.top('calories', training_type='Running') == []
+
+
+def test_leaderboard_late_workouts():
+    leaderboard = Leaderboard(k=2, ttl=10)
+    leaderboard.add(homework.read_package(*PACKAGES[3]), 100, key='new')
+    leaderboard.add(homework.read_package(*PACKAGES[1]), 0, key='stale')
+    assert [entry.key for entry in leaderboard.top('calories')] == [
+        'new'
+    ], (
+        'Тренировки старше новейшей более чем на ttl не должны '
+        'попадать в рейтинг.'
+    )
+    assert leaderboard.top('calories', now=50) != []
+    assert len(leaderboard) == 1
+
+
+def test_leaderboard_matches_scan():
+    generator = random.Random(20)
+    leaderboard = Leaderboard(k=5, ttl=50)
+    entries = []
+    for timestamp in range(300):
+        workout_type, data = generator.choice(PACKAGES)
+        data = [value * generator.uniform(0.5, 2) for value in data]
+        info = homework.read_package(workout_type, data).show_training_info()
+        leaderboard.add(info, timestamp, key=timestamp)
+        entries.append((timestamp, info))
+        alive = [(timestamp, info) for timestamp, info in entries
+                 if timestamp > entries[-1][0] - 50]
+        for training_type in (None, 'Swimming'):
+            scan = sorted(
+                ((info.calories, timestamp) for timestamp, info in alive
+                 if training_type in (None, info.training_type)),
+                reverse=True
+            )
+            assert [entry.key for entry in leaderboard.top(
+                'calories', training_type
+            )] == [timestamp for _, timestamp in scan[:5]]
+        assert len(leaderboard) == len(alive)
@@ -0,0 +1,49 @@
+import io
+
+import pytest
+
+import homework
+from pipeline import Pipeline
+
+LINES = [
+    'SWM,720,1,80,25,40',
+    '["RUN", [15000, 1, 75]]',
+    'WLK,9000,1,75,180',
+    'RUN,1206,12,6',
+]
+
+
+@pytest.mark.parametrize('readers, workers, writers', [
+    (1, 1, 1), (4, 2, 2),
+])
+def test_pipeline(tmp_path, readers, workers, writers):
+    path = tmp_path / 'packages.csv'
+    path.write_text('\n'.join(LINES * 50), encoding='utf-8')
+    sources = [str(path), LINES * 30, iter(LINES + ['RUN,1,0,75'])]
+    pipeline = Pipeline(readers=readers, workers=workers, writers=writers,
+                        queue_size=2, chunk_size=7, batch_size=20)
+    out = io.StringIO()
+    assert pipeline.run(sources, out) == len(LINES) * 81
+    expected = [
+        info.get_message()
+        for info in homework.process_packages(
+            homework.read_packages(LINES * 81)
+        )
+    ]
+    assert sorted(out.getvalue().splitlines()) == sorted(expected), (
+        'Конвейер должен выводить сообщения обо всех пакетах.'
+    )
+    assert [package for package, _ in pipeline.rejects] == [
+        ('RUN', [1, 0, 75])
+    ]
+    stats = pipeline.stats()
+    assert stats['packages']['puts'] == 29 + 18 + 1 + workers
+    assert 1 <= stats['messages']['max_depth'] <= 2
+
+
+def test_pipeline_errors():
+    pipeline = Pipeline()
+    out = io.StringIO()
+    with pytest.raises(FileNotFoundError):
+        pipeline.run(['missing.csv', LINES], out)
+    assert len(out.getvalue().splitlines()) == len(LINES)
@@ -0,0 +1,85 @@
+import asyncio
+import json
+
+import pytest
+
+import homework
+from server import PackageServer
+
+
+async def exchange(server, lines):
+    listener = await server.start(port=0)
+    port = listener.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(''.join(line + '\n' for line in lines).encode())
+    writer.write_eof()
+    answers = [line.decode().rstrip('\n') async for line in reader]
+    writer.close()
+    listener.close()
+    await listener.wait_closed()
+    return answers
+
+
+def test_server_text():
+    packages = [('SWM', [720, 1, 80, 25, 40]), ('RUN', [15000, 1, 75])]
+    lines = [json.dumps(package) for package in packages] * 3
+    answers = asyncio.run(exchange(PackageServer(batch_size=2), lines))
+    expected = [
+        homework.read_package(*package).show_training_info().get_message()
+        for package in packages
+    ] * 3
+    assert answers == expected, (
+        'Сервер должен отвечать сообщением `get_message` '
+        'на каждый пакет в порядке получения.'
+    )
+
+
+@pytest.mark.parametrize('line', [
+    '["BOX", [1, 1, 1]]',
+    '["RUN", [1, 0, 75]]',
+    '{"data": [1, 1, 1]}',
+    'not json',
+])
+def test_server_errors(line):
+    answers = asyncio.run(exchange(PackageServer(), [line]))
+    assert len(answers) == 1
+    assert 'error' in json.loads(answers[0]), (
+        'На ошибочный пакет сервер должен отвечать объектом с ошибкой.'
+    )
+
+
+def test_server_json():
+    answers = asyncio.run(exchange(PackageServer('json'),
+                                   ['["RUN", [15000, 1, 75]]']))
+    training = homework.read_package('RUN', [15000, 1, 75])
+    info = training.show_training_info()
+    assert json.loads(answers[0]) == {
+        'training_type': 'Running',
+        'duration': 1,
+        'distance': info.distance,
+        'speed': info.speed,
+        'calories': info.calories,
+    }
+
+
+def test_server_overflow():
+    line = '["RUN", [1' + '0' * 400 + ', 1, 75]]'
+    answers = asyncio.run(asyncio.wait_for(
+        exchange(PackageServer(), [line, '["RUN", [15000, 1, 75]]']), 3
+    ))
+    assert 'error' in json.loads(answers[0])
+    assert answers[1].startswith('Тип тренировки: Running;')
+
+
+def test_server_stopped_answering(monkeypatch):
+    def broken(line):
+        raise RuntimeError('answer failed')
+
+    server = PackageServer(batch_size=1, queue_size=1)
+    monkeypatch.setattr(server, 'answer', broken)
+    lines = ['["RUN", [15000, 1, 75]]'] * 50
+    answers = asyncio.run(asyncio.wait_for(exchange(server, lines), 3))
+    assert answers == [], (
+        'Соединение должно закрываться, если ответы перестали '
+        'отправляться.'
+    )
@@ -0,0 +1,56 @@
+from datetime import date
+
+import pytest
+
+import homework
+from aggregation import Aggregator
+from shards import Coordinator, shard_of
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+]
+ATHLETES = ['first', 'second', 'third', 'fourth', 'fifth']
+
+
+def records():
+    for index in range(200):
+        workout_type, data = PACKAGES[index % len(PACKAGES)]
+        yield (ATHLETES[index % len(ATHLETES)], date(2021, 10, 1 + index % 7),
+               workout_type, data)
+
+
+def test_shard_of():
+    assert shard_of('first', 4) == shard_of('first', 4)
+    assert {shard_of(athlete, 2) for athlete in ATHLETES} == {0, 1}
+
+
+@pytest.mark.parametrize('chunk_size, window', [(256, 4), (3, 1)])
+def test_coordinator_matches_local(chunk_size, window):
+    expected = Aggregator()
+    messages = []
+    for athlete, day, workout_type, data in records():
+        info = homework.read_package(workout_type, data).show_training_info()
+        expected.add(athlete, info, day)
+        messages.append(info.get_message())
+    data = list(records()) + [('first', date(2021, 10, 1), 'RUN', [1, 0, 1])]
+    with Coordinator(workers=2, chunk_size=chunk_size,
+                     window=window) as coordinator:
+        result = coordinator.run(data)
+        again = coordinator.run(data[:10])
+    assert result.messages == messages + [None], (
+        'Сообщения должны возвращаться в порядке пакетов.'
+    )
+    assert result.errors == [(200, 'duration must be positive, got 0')]
+    assert set(result.aggregator.athletes) == set(ATHLETES)
+    for athlete, stats in expected.athletes.items():
+        totals = result.aggregator.athletes[athlete].totals
+        assert totals.count == stats.totals.count
+        assert totals.metrics['calories'].total == pytest.approx(
+            stats.totals.metrics['calories'].total
+        )
+    assert again.messages == messages[:10]
+    assert sum(stats.totals.count
+               for stats in again.aggregator.athletes.values()) == 10
@@ -0,0 +1,46 @@
+import pytest
+
+from homework import TRAINING_TYPES, read_package
+from splits import Splits
+
+
+def test_splits_finish_matches_whole_workout():
+    splits = Splits('RUN', window=60, weight=75)
+    for _ in range(3600):
+        splits.add(5)
+    assert splits.finish() == read_package(
+        'RUN', [18000, 1, 75]
+    ).show_training_info(), (
+        'Итог по отсчётам должен совпадать с расчётом всей тренировки.'
+    )
+
+
+@pytest.mark.parametrize('workout_type, constants, add', [
+    ('WLK', {'weight': 75, 'height': 180}, {}),
+    ('SWM', {'weight': 80, 'length_pool': 25}, {'count_pool': 1}),
+])
+def test_splits_window_matches_training(workout_type, constants, add):
+    splits = Splits(workout_type, window=4, interval=900, **constants)
+    for steps in (100, 200, 300, 400, 500):
+        split = splits.add(steps, **add)
+    package = {'action': 1400, 'duration': 1.0, 'count_pool': 4,
+               **constants}
+    training = TRAINING_TYPES[workout_type](
+        *[package[name] for name in splits.fields]
+    )
+    assert split.end == 4500
+    assert split.distance == pytest.approx(training.get_distance())
+    assert split.speed == pytest.approx(training.get_mean_speed())
+    assert split.calories == pytest.approx(training.get_spent_calories())
+
+
+def test_splits_need_constants():
+    with pytest.raises(ValueError):
+        Splits('WLK', weight=75)
+    with pytest.raises(ValueError):
+        Splits('RUN', window=0, weight=75)
+
+
+def test_splits_finish_without_samples():
+    with pytest.raises(ValueError, match='without samples'):
+        Splits('RUN', weight=75).finish()
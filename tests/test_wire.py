@@ -0,0 +1,73 @@
+import io
+
+import pytest
+
+import homework
+import wire
+
+PACKAGES = [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [15000, 1, 75]),
+    ('WLK', [9000, 1, 75, 180]),
+    ('RUN', [1206, 12, 6]),
+]
+
+
+@pytest.fixture
+def records(tmp_path):
+    path = tmp_path / 'packages.bin'
+    with open(path, 'wb') as out:
+        assert wire.write_packages(PACKAGES, out) == len(PACKAGES)
+    return str(path)
+
+
+def test_encode_package():
+    record = wire.encode_package('WLK', [9000, 1, 75, 180])
+    assert len(record) == wire.RECORD.size == 56
+    assert wire.RECORD.unpack(record) == (
+        b'WLK\0\0\0\0\0', 9000, 1, 75, 180, 0, 0
+    )
+    with pytest.raises(ValueError):
+        wire.encode_package('WLK', [9000, 1, 75])
+
+
+def test_package_file_trainings(records):
+    with wire.PackageFile(records) as package_file:
+        assert len(package_file) == len(PACKAGES)
+        messages = [training.show_training_info().get_message()
+                    for training in package_file]
+    assert messages == [
+        homework.read_package(*package).show_training_info().get_message()
+        for package in PACKAGES
+    ], 'Записи должны декодироваться в те же тренировки.'
+
+
+def test_package_file_calculate(records):
+    with wire.PackageFile(records) as package_file:
+        assert package_file.workout_types() == [
+            workout_type for workout_type, _ in PACKAGES
+        ]
+        distance, speed, calories = package_file.calculate()
+    for index, package in enumerate(PACKAGES):
+        info = homework.read_package(*package).show_training_info()
+        assert (distance[index], speed[index], calories[index]) == (
+            info.distance, info.speed, info.calories
+        )
+
+
+def test_package_file_empty_and_broken(tmp_path):
+    empty = tmp_path / 'empty.bin'
+    empty.write_bytes(b'')
+    with wire.PackageFile(str(empty)) as package_file:
+        assert list(package_file) == []
+        assert package_file.calculate() == ([], [], [])
+    broken = tmp_path / 'broken.bin'
+    broken.write_bytes(b'\0' * 10)
+    with pytest.raises(ValueError):
+        wire.PackageFile(str(broken))
+
+
+def test_write_packages_from_text():
+    out = io.BytesIO()
+    wire.write_packages(homework.read_packages(['RUN,15000,1,75']), out)
+    assert out.getvalue() == wire.encode_package('RUN', [15000, 1, 75])
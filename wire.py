@@ -0,0 +1,151 @@
+"""Fixed-layout binary records for sensor packages.
+
+A record is 56 bytes: the workout type code as 8 ASCII bytes padded
+with zeros, then the package values as six little-endian doubles in
+TrainingBatch.FIELDS order (action, duration, weight, height,
+length_pool, count_pool). Values a workout type doesn't use are 0.
+
+Since every field sits at a fixed stride, a memory-mapped file of
+records is read as strided memoryview columns without copying, which
+calculate_batch() consumes directly. On big-endian hosts the columns
+are copied into byteswapped arrays instead.
+
+Usage: python wire.py convert PACKAGES.csv RECORDS.bin
+"""
+from __future__ import annotations
+
+import mmap
+import struct
+import sys
+from array import array
+from typing import (TYPE_CHECKING, BinaryIO, Dict, Iterable, Iterator, List,
+                    Tuple, Type)
+
+from homework import (TRAINING_TYPES, Training, TrainingBatch,
+                      calculate_batch, get_training_class, package_error,
+                      read_packages)
+
+if TYPE_CHECKING:
+    from homework import Columns, MetricColumns, Package
+
+RECORD = struct.Struct('<8s6d')
+FIELDS = TrainingBatch.FIELDS
+STRIDE = RECORD.size // 8
+
+
+def encode_package(workout_type: str, data: Iterable[float]) -> bytes:
+    """Packs a package into a record."""
+    training_class = get_training_class(workout_type)
+    data = list(data)
+    if len(data) != training_class.ARITY:
+        raise package_error(workout_type, data)
+    row = dict(zip(training_class.get_fields(), data))
+    return RECORD.pack(workout_type.encode('ascii'),
+                       *[row.get(name, 0) for name in FIELDS])
+
+
+def write_packages(packages: Iterable[Package], out: BinaryIO) -> int:
+    """Writes packages to out as records, get back their number."""
+    count = 0
+    for workout_type, data in packages:
+        out.write(encode_package(workout_type, data))
+        count += 1
+    return count
+
+
+def type_code(workout_type: str) -> int:
+    """Get back the code field of a record as an unsigned integer, as
+    read through a native-order 'Q' view of the record."""
+    return int.from_bytes(workout_type.encode('ascii').ljust(8, b'\0'),
+                          sys.byteorder)
+
+
+class PackageFile:
+    """Memory-mapped file of records.
+
+    Column views returned by columns() point into the mapping, so they
+    have to be released before the file is closed.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, 'rb')
+        size = self._file.seek(0, 2)
+        if size % RECORD.size:
+            self._file.close()
+            raise ValueError(f'{path} size {size} is not a multiple of '
+                             f'the {RECORD.size} bytes record')
+        self._map = (mmap.mmap(self._file.fileno(), 0,
+                               access=mmap.ACCESS_READ) if size else None)
+        self._view = memoryview(self._map if size else b'')
+
+    def __enter__(self) -> 'PackageFile':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._view) // RECORD.size
+
+    def close(self) -> None:
+        self._view.release()
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def __iter__(self) -> Iterator[Training]:
+        """Yields a Training object per record."""
+        classes: Dict[bytes, Tuple[Type[Training], List[int]]] = {}
+        for code, *values in RECORD.iter_unpack(self._view):
+            known = classes.get(code)
+            if known is None:
+                training_class = get_training_class(
+                    code.rstrip(b'\0').decode('ascii')
+                )
+                known = classes[code] = (
+                    training_class,
+                    [FIELDS.index(name)
+                     for name in training_class.get_fields()],
+                )
+            training_class, positions = known
+            yield training_class(*[values[index] for index in positions])
+
+    def workout_types(self) -> List[str]:
+        """Get back the workout type code of every record."""
+        names = {type_code(code): code for code in TRAINING_TYPES}
+        with self._view.cast('Q') as words:
+            return [names.get(word)
+                    or word.to_bytes(8, sys.byteorder).rstrip(b'\0').decode()
+                    for word in words[::STRIDE]]
+
+    def columns(self) -> Columns:
+        """Get back zero-copy views of the value columns, or views of
+        byteswapped copies on big-endian hosts."""
+        doubles = self._view.cast('d')
+        if sys.byteorder == 'little':
+            return {name: doubles[index + 1::STRIDE]
+                    for index, name in enumerate(FIELDS)}
+        columns = {}
+        for index, name in enumerate(FIELDS):
+            column = array('d', doubles[index + 1::STRIDE])
+            column.byteswap()
+            columns[name] = memoryview(column)
+        doubles.release()
+        return columns
+
+    def calculate(self) -> MetricColumns:
+        """Calculates distance, speed and calories for every record."""
+        columns = self.columns()
+        try:
+            return calculate_batch(self.workout_types(), **columns)
+        finally:
+            for column in columns.values():
+                column.release()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 4 or sys.argv[1] != 'convert':
+        sys.exit(__doc__.splitlines()[-1])
+    with open(sys.argv[2], encoding='utf-8') as source, \
+            open(sys.argv[3], 'wb') as target:
+        write_packages(read_packages(source), target)